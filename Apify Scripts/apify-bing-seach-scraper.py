@@ -1,17 +1,23 @@
+import asyncio
+import random
+from urllib.parse import urlencode
+
+import httpx
 import requests
 from bs4 import BeautifulSoup
 from apify import Actor
 
-def scrape_bing(query):
-    url = f"https://www.bing.com/search?q={query}"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    response = requests.get(url, headers=headers)
-    
-    if response.status_code != 200:
-        print("Failed to retrieve search results")
-        return []
-    
-    soup = BeautifulSoup(response.text, "html.parser")
+BING_URL = "https://www.bing.com/search"
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def search_url(query, page=0, base_url=BING_URL):
+    # Encode the query instead of pasting it into the URL; page n starts at result 10n + 1
+    params = {"q": query, "first": page * 10 + 1} if page else {"q": query}
+    return f"{base_url}?{urlencode(params)}"
+
+def parse_results(html):
+    soup = BeautifulSoup(html, "html.parser")
     results = []
 
     for item in soup.find_all("li", class_="b_algo"):
@@ -23,21 +29,82 @@ def scrape_bing(query):
         })
     return results
 
+def scrape_bing(query):
+    response = requests.get(search_url(query), headers=HEADERS)
+
+    if response.status_code != 200:
+        print("Failed to retrieve search results")
+        return []
+
+    return parse_results(response.text)
+
+async def scrape_bing_many(queries, pages=1, concurrency=20, retries=3, base_url=BING_URL):
+    """
+    Async generator yielding {"query", "title", "link"} items for many queries as their pages arrive.
+    All requests share one pooled HTTP/2 client capped at `concurrency` connections (they all go
+    to the same host); 429/5xx responses and network errors are retried with exponential backoff.
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    results = asyncio.Queue()
+
+    async with httpx.AsyncClient(http2=True, headers=HEADERS, timeout=10, limits=limits,
+                                 follow_redirects=True) as client:
+
+        async def fetch(url):
+            for attempt in range(retries + 1):
+                try:
+                    response = await client.get(url)
+                    if response.status_code == 200:
+                        return response.text
+                    if response.status_code not in RETRY_STATUSES:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.5 * 2 ** attempt * random.uniform(0.5, 1.5))
+            print(f"Failed to retrieve {url}")
+            return None
+
+        async def scrape(query):
+            seen = set()
+            for page in range(pages):
+                html = await fetch(search_url(query, page, base_url))
+                new = [item for item in parse_results(html or "") if item["link"] not in seen]
+                if not new:
+                    break  # failed page, or past the last page of results
+                for item in new:
+                    seen.add(item["link"])
+                    results.put_nowait({"query": query, **item})
+
+        async def worker(todo):
+            try:
+                for query in todo:
+                    await scrape(query)
+            finally:
+                results.put_nowait(None)  # this worker is finished
+
+        todo = iter(queries)
+        workers = [asyncio.create_task(worker(todo)) for _ in range(concurrency)]
+        running = len(workers)
+        while running:
+            item = await results.get()
+            if item is None:
+                running -= 1
+            else:
+                yield item
+        await asyncio.gather(*workers)  # surface errors
+
 async def main():
     async with Actor:
-        # In this version we use a default query; replace with input handling as needed.
-        query = "apify"
-        search_results = scrape_bing(query)
-        for item in search_results:
+        actor_input = await Actor.get_input() or {}
+        queries = actor_input.get("queries", ["apify"])
+        async for item in scrape_bing_many(queries, pages=actor_input.get("pages", 1)):
             await Actor.push_data(item)
 
 if __name__ == "__main__":
-    import asyncio
-
     # For local testing, print the results:
     results = scrape_bing("apify")
     for idx, item in enumerate(results, 1):
         print(f"{idx}. {item['title']}: {item['link']}\n")
-    
+
 # Uncomment the following line when deploying to Apify:
 # asyncio.run(main())
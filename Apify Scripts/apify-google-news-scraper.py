@@ -1,23 +1,83 @@
+import asyncio
+import time
+from urllib.parse import urljoin
+
+import httpx
 import requests
 from bs4 import BeautifulSoup
 from apify import Actor
 
+DEFAULT_TOPIC = "CAAqJggKIiBDQkFTRWdvSUwyMHZNRGx1YlY4U0FtVnVHZ0pWVXlnQVAB"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+SEEN_MAX_AGE = 30 * 86400  # forget links after 30 days
+
 async def main():
     async with Actor:
         # Initialize the Apify Actor
-        news_items = get_google_news()
-        
+        actor_input = await Actor.get_input() or {}
+        topics = actor_input.get("topics", [DEFAULT_TOPIC])
+
+        # Validators and seen links of earlier runs live in the actor's key-value store,
+        # so every scheduled run pushes only the stories it has not pushed before
+        state = await Actor.get_value("STATE") or {"validators": {}, "seen": {}}
+        news_items = await collect_google_news(topics, state)
+        await Actor.set_value("STATE", state)
+
         # Push each news item into the dataset
         for item in news_items:
             await Actor.push_data(item)
 
+async def collect_google_news(topics, state, concurrency=8):
+    """
+    Fetches all `topics` concurrently with conditional requests (unchanged pages come back as
+    an empty 304) and returns only the stories whose link is not in state["seen"] yet.
+    """
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(headers=HEADERS, limits=limits, timeout=10, follow_redirects=True) as client:
+
+        async def fetch(topic):
+            validators = state["validators"].get(topic, {})
+            headers = {}
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+            try:
+                return await client.get(topic_url(topic), headers=headers)
+            except httpx.TransportError as e:
+                print(f"Failed to fetch topic {topic}: {e}")
+                return None
+
+        responses = await asyncio.gather(*(fetch(topic) for topic in topics))
+
+    now = time.time()
+    state["seen"] = {link: first_seen for link, first_seen in state["seen"].items() if now - first_seen < SEEN_MAX_AGE}
+    new_items = []
+    for topic, response in zip(topics, responses):
+        if response is None or response.status_code != 200:
+            continue  # 304 Not Modified, or failed
+        state["validators"][topic] = {"etag": response.headers.get("ETag"),
+                                      "last_modified": response.headers.get("Last-Modified")}
+        for item in parse_news(response.content, limit=None):
+            if not item["link"]:
+                # Nothing to dedupe on; recording "" would hide every later link-less story
+                new_items.append(dict(item, topic=topic))
+            elif item["link"] not in state["seen"]:
+                state["seen"][item["link"]] = now
+                new_items.append(dict(item, topic=topic))
+    return new_items
+
+def topic_url(topic):
+    return f"https://news.google.com/topics/{topic}?ceid=US:en&oc=3"
+
 def get_google_news():
-    url = "https://news.google.com/topics/CAAqJggKIiBDQkFTRWdvSUwyMHZNRGx1YlY4U0FtVnVHZ0pWVXlnQVAB?ceid=US:en&oc=3"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    response = requests.get(topic_url(DEFAULT_TOPIC), headers=HEADERS)
+    return parse_news(response.content)
+
+def parse_news(html, limit=10):
+    soup = BeautifulSoup(html, 'html.parser')
 
     news_items = []
     containers = soup.find_all('div', class_='W8yrY')
@@ -35,7 +95,8 @@ def get_google_news():
             source = source_elem.get_text(strip=True) if source_elem else 'Unknown source'
 
             relative_link = headline_elem['href'] if headline_elem else ''
-            absolute_link = f'https://news.google.com{relative_link.split("?")[0]}' if relative_link else ''
+            # hrefs are relative ("./read/CBMi...?hl=en-US"), so resolve them against the site root
+            absolute_link = urljoin('https://news.google.com/', relative_link.split("?")[0]) if relative_link else ''
 
             news_items.append({
                 'source': source,
@@ -43,7 +104,7 @@ def get_google_news():
                 'link': absolute_link
             })
 
-            if len(news_items) >= 10:
+            if limit and len(news_items) >= limit:
                 break
 
         except Exception as e:
@@ -53,7 +114,6 @@ def get_google_news():
     return news_items
 
 if __name__ == "__main__":
-    import asyncio
     # For local testing (prints results)
     news = get_google_news()
     for idx, item in enumerate(news, 1):
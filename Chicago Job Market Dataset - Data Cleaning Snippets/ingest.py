@@ -0,0 +1,87 @@
+# Parallel ingestion of daily Indeed exports (same schema as `Indeed_tech jobs_chicago_2024.csv`).
+# Every new export is parsed and cleaned in its own worker process, the results are concatenated
+# once, and merged into a cleaned Parquet store keyed on the posting `id`:
+#
+#   python ingest.py exports/*.csv --store jobs_store.parquet
+#
+# A manifest next to the store remembers which files (by content hash) were already ingested,
+# so each day's run only processes the new exports.
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from cleaning import (clean_chunk, column_dtypes, columns_to_keep, file_digest,
+                      read_cleaned_parquet, write_cleaned_parquet)
+
+# The posting id is what incremental merges are keyed on, so it is kept alongside the usual columns
+snapshot_columns = ['id'] + columns_to_keep
+snapshot_dtypes = {'id': 'object', **column_dtypes}
+
+
+def read_snapshot(path):
+    """Parses and cleans one export, aligned to `snapshot_columns` (missing columns come back empty)."""
+    header = pd.read_csv(path, nrows=0).columns
+    present = [column for column in snapshot_columns if column in header]
+    df = pd.read_csv(path, usecols=present, dtype={column: snapshot_dtypes[column] for column in present})
+    df = df.reindex(columns=snapshot_columns).astype(snapshot_dtypes)
+    return clean_chunk(df)
+
+
+def _manifest_path(store):
+    return os.path.splitext(store)[0] + '.manifest.json'
+
+
+def ingest_snapshots(paths, store='jobs_store.parquet', workers=None):
+    """Merges the exports in `paths` that are not in the store yet, and returns the updated store.
+
+    Files are processed in sorted order, so for an `id` present in several exports the row from
+    the latest file (by name) wins; rows without an id are always kept.
+    """
+    manifest_path = _manifest_path(store)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    known = set(manifest.values())
+    digests = {path: file_digest(path) for path in sorted(paths)}
+    new_paths = [path for path, digest in digests.items() if digest not in known]
+
+    existing = read_cleaned_parquet(store) if os.path.exists(store) else None
+    if not new_paths:
+        print("No new exports to ingest")
+        return existing
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(read_snapshot, new_paths))
+    print(f"Parsed {len(new_paths)} new exports ({sum(len(frame) for frame in frames)} cleaned rows)")
+
+    # One concat for everything instead of growing the frame file by file
+    if existing is not None:
+        frames.insert(0, existing)
+    df = pd.concat(frames, ignore_index=True)
+
+    has_id = df['id'].notna()
+    df = pd.concat([df[has_id].drop_duplicates(subset='id', keep='last'), df[~has_id]], ignore_index=True)
+
+    write_cleaned_parquet(df, store)
+    manifest.update({os.path.basename(path): digests[path] for path in new_paths})
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+    print(f"Store now holds {len(df)} postings")
+    return read_cleaned_parquet(store)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Ingest daily Indeed exports into a cleaned Parquet store.")
+    parser.add_argument('paths', nargs='+', help="export CSV files")
+    parser.add_argument('--store', default='jobs_store.parquet', help="cleaned Parquet store to merge into")
+    parser.add_argument('--workers', type=int, default=None, help="parser processes (default: one per CPU)")
+    args = parser.parse_args()
+    ingest_snapshots(args.paths, store=args.store, workers=args.workers)
@@ -1,42 +1,35 @@
 import pandas as pd
-import re
 import plotly.express as px
+from cleaning import column_dtypes, columns_to_keep, normalize_strings, parse_salary, renamed_columns
+from near_duplicates import drop_near_duplicates
+from outliers import flag_outliers
 
-df = pd.read_csv('Indeed_tech jobs_chicago_2024.csv') # loading the CSV file
+# loading the CSV file: only the columns we keep (columns_to_keep in cleaning.py) are parsed,
+# with explicit dtypes, so the descriptionHTML blobs and the other columns never reach memory.
+# For scrapes too big for memory, run `python cleaning.py scrape.csv cleaned.csv` instead
+df = pd.read_csv('Indeed_tech jobs_chicago_2024.csv', usecols=columns_to_keep, dtype=column_dtypes)
 
-# Specify the columns you want to keep
-columns_to_keep = ['company', 'companyInfo/rating', 'description', 'jobType/0', 'location', 'positionName', 'postingDateParsed', 'salary']
+df = df[columns_to_keep] # updating the dataframe (same column order as before)
 
-df = df[columns_to_keep] # updating the dataframe
-
-# key = existing name
-# value = new name
-renamed_columns = {'companyInfo/rating': 'Company Rating',
-        'jobType/0': 'Job Type',
-        'postingDateParsed': 'Date Posted'}
-
-# call rename () method
+# call rename () method (renamed_columns in cleaning.py maps existing names to new ones)
 df.rename(columns=renamed_columns,
           inplace=True)
 
 print("Duplicates not removed: ", df.shape)
 df = df.drop_duplicates()
 print("Duplicates removed:",df.shape)
+# Reposts of the same job (new posting date, lightly edited description) -- see near_duplicates.py
+df = drop_near_duplicates(df, column='description', threshold=0.9)
+print("Near-duplicates removed:",df.shape)
 
-df['salary'] = df['salary'].astype(str)
-# Removing all the texts, strings, chars and dollar sign in salary column
-df['salary'] = df['salary'].apply(lambda x: re.sub(r'[^\d.-]', '', x))
-# If the data points include a range with hyphen (-), calculate and update the value for avg of the range.
-df['salary'] = df['salary'].apply(lambda x: sum(map(float, x.split('-')))/2 if '-' in x else float(x) if x != '' else 0)
-# Checking whether the values in salary column data points are high or less than 100.
-df['salary'] = df['salary'].apply(lambda x: x if x > 100 else x * 2000)
+# Strips the text and dollar signs, averages ranges, turns hourly rates into yearly salaries
+# and marks missing salaries (0) as NaN -- see cleaning.py
+df['salary'] = parse_salary(df['salary'])
 
 df['Company Rating'].fillna("N/A", inplace=True)
 df['Job Type'].fillna("N/A", inplace=True)
 
 print("before deleting null values: ", df.shape)
-# Replace 0.0 float values with None
-df['salary'] = df['salary'].apply(lambda x: None if x == 0.0 else x)
 df = df.dropna(subset=['salary'])
 print("after deleting null values: ",df.shape)
 
@@ -46,14 +39,11 @@ df['Date Posted'] = df['Date Posted'].apply(lambda x: x.split('T')[0])
 #Split the text by T and then remove it.
 
 
-df = df.map(lambda x: x.strip() if isinstance(x, str) else x) # Removing whitespaces
-df = df.map(lambda x: x.lower() if isinstance(x, str) else x) # Converting text to lowercase
+# Removing whitespaces and converting text to lowercase (text columns only, as Arrow-backed strings)
+df = normalize_strings(df, arrow=True)
 
-# Outlier detection
-mean_salary = df['salary'].mean()
-std_salary = df['salary'].std()
-cutoff = std_salary * 3
-df['Outlier'] = df['salary'].apply(lambda x: abs(x - mean_salary) > cutoff)
+# Outlier detection: 3 standard deviations from the mean (method='mad' or 'iqr' for robust variants)
+df['Outlier'] = flag_outliers(df['salary'], method='std')
 # Print rows where 'Outlier' is True
 outliers = df[df['Outlier']]
 print(outliers)
@@ -0,0 +1,110 @@
+# Near-duplicate job posting detection.
+# `df.drop_duplicates()` only removes byte-identical rows; a job reposted with a new date or a
+# lightly edited description survives it. Here every description is shingled into word 5-grams,
+# summarised as a MinHash signature and bucketed with LSH (locality-sensitive hashing), so only
+# postings that share a bucket are ever compared -- roughly linear time instead of all pairs.
+
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Smallest prime above 2**32: with a, b and the shingle hashes below 2**32, a*x + b fits in uint64
+_PRIME = np.uint64(4294967311)
+_EMPTY = np.iinfo(np.uint64).max
+
+
+def shingles(text, k=5):
+    """The set of lowercase word k-grams of `text` (empty for a missing value)."""
+    if pd.isna(text):
+        return set()
+    words = re.findall(r'\w+', str(text).lower())
+    if len(words) <= k:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def _same_key(value):
+    # "Data Scientist " and "data scientist" are the same title; all missing values compare equal
+    if pd.isna(value):
+        return None
+    return value.strip().lower() if isinstance(value, str) else value
+
+
+def minhash_signatures(texts, num_perm=128, k=5, seed=1):
+    """One row of `num_perm` MinHash values per text; texts without words get an all-_EMPTY row."""
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+    signatures = np.full((len(texts), num_perm), _EMPTY, dtype=np.uint64)
+    for row, text in enumerate(texts):
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles(text, k)), dtype=np.uint64)
+        if len(hashes):
+            # Each of the num_perm hash functions (a*x + b) mod p applied to every shingle at once
+            signatures[row] = ((hashes[:, None] * a + b) % _PRIME).min(axis=0)
+    return signatures
+
+
+def lsh_params(threshold, num_perm):
+    """Picks (bands, rows per band) so the LSH S-curve is steepest close to `threshold`."""
+    candidates = [(bands, num_perm // bands) for bands in range(1, num_perm + 1)]
+    return min(candidates, key=lambda p: abs((1 / p[0]) ** (1 / p[1]) - threshold))
+
+
+def find_near_duplicates(df, column='description', threshold=0.9, num_perm=128, shingle_size=5,
+                         same=('company', 'positionName')):
+    """Labels every row with the index of the first row (in frame order) it is a near-duplicate of
+    (itself if none). Sort the frame first, e.g. by 'Date Posted', to keep the earliest posting.
+
+    Two rows match when the estimated Jaccard similarity of their `column` shingles is at least
+    `threshold` and they agree on the `same` columns (by default the company and the job title,
+    ignoring case and surrounding whitespace). Without the title, one company's different roles
+    that share its boilerplate (e.g. "Data Scientist" and "Sr. Data Scientist") would be merged.
+    """
+    signatures = minhash_signatures(df[column].tolist(), num_perm, shingle_size)
+    bands, rows = lsh_params(threshold, num_perm)
+    has_text = signatures[:, 0] != _EMPTY
+    same_values = [tuple(_same_key(value) for value in values)
+                   for values in df[list(same)].itertuples(index=False)] if same else None
+
+    # Union-find over row positions
+    parent = np.arange(len(df))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        buckets = {}
+        for position in np.flatnonzero(has_text):
+            key = signatures[position, band * rows:(band + 1) * rows].tobytes()
+            buckets.setdefault(key, []).append(position)
+
+        for members in buckets.values():
+            # Split the bucket by the `same` columns, so every company gets its own anchor
+            groups = {}
+            for position in members:
+                groups.setdefault(same_values[position] if same_values is not None else None, []).append(position)
+
+            for group in groups.values():
+                # Every member is checked against its group's first posting only, which keeps
+                # huge buckets (mass-posted boilerplate) linear instead of quadratic
+                anchor = group[0]
+                for other in group[1:]:
+                    if np.mean(signatures[anchor] == signatures[other]) >= threshold:
+                        root_a, root_b = find(anchor), find(other)
+                        # The row that comes first in the frame stays the representative of its group
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    roots = [find(position) for position in range(len(df))]
+    return pd.Series(df.index[roots], index=df.index, name='duplicate_of')
+
+
+def drop_near_duplicates(df, column='description', threshold=0.9, **kwargs):
+    """Keeps only the first row (in frame order) of every group of near-duplicates (see `find_near_duplicates`)."""
+    duplicate_of = find_near_duplicates(df, column, threshold, **kwargs)
+    return df[duplicate_of.index == duplicate_of.to_numpy()]
@@ -0,0 +1,117 @@
+# Outlier detection for the cleaned job market data.
+# Works in memory (`flag_outliers`) or in two streaming passes over a cleaned CSV
+# (`remove_outliers_in_chunks`), so datasets larger than RAM can be filtered too.
+
+import numpy as np
+import pandas as pd
+
+# Default width of the "normal" band for each method:
+#   std - mean +/- 3 standard deviations (the original 3-sigma rule)
+#   mad - median +/- 3.5 scaled median absolute deviations
+#   iqr - [Q1 - 1.5 IQR, Q3 + 1.5 IQR] (Tukey's fences, Method II of the cheatsheet)
+DEFAULT_K = {'std': 3, 'mad': 3.5, 'iqr': 1.5}
+
+
+class RunningStats:
+    """Streaming count/mean/variance (Welford), updated one chunk at a time.
+
+    Two instances built on different chunks or workers can be combined with `merge`.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared differences from the mean
+
+    def update(self, values):
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        chunk = RunningStats()
+        chunk.count = len(values)
+        chunk.mean = values.mean()
+        chunk.m2 = ((values - chunk.mean) ** 2).sum()
+        return self.merge(chunk)
+
+    def merge(self, other):
+        # Chan et al.'s pairwise combination of two (count, mean, M2) summaries
+        count = self.count + other.count
+        if count == 0:
+            return self
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def variance(self):
+        # Sample variance (ddof=1), the same as pandas' Series.var()
+        return self.m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+
+def outlier_bounds(values, method='std', k=None):
+    """Returns the (low, high) range of non-outlier values for `method`.
+
+    For 'std', `values` may also be a `RunningStats` summary.
+    """
+    if method not in DEFAULT_K:
+        raise ValueError(f"Unknown outlier method {method!r}, expected one of {', '.join(DEFAULT_K)}")
+    k = DEFAULT_K[method] if k is None else k
+
+    if method == 'std':
+        stats = values if isinstance(values, RunningStats) else RunningStats().update(values)
+        cutoff = stats.std * k
+        return float(stats.mean - cutoff), float(stats.mean + cutoff)
+
+    values = np.asarray(values, dtype='float64')
+    values = values[~np.isnan(values)]
+    if method == 'mad':
+        median = np.median(values)
+        # 1.4826 scales the MAD to a standard deviation for normally distributed data
+        cutoff = 1.4826 * np.median(np.abs(values - median)) * k
+        return float(median - cutoff), float(median + cutoff)
+
+    q1, q3 = np.percentile(values, [25, 75])
+    iqr = q3 - q1
+    return float(q1 - k * iqr), float(q3 + k * iqr)
+
+
+def flag_outliers(salary, method='std', k=None):
+    """Boolean Series marking the rows of `salary` that fall outside `outlier_bounds`."""
+    low, high = outlier_bounds(salary.to_numpy(), method, k)
+    return (salary < low) | (salary > high)
+
+
+def remove_outliers_in_chunks(source, destination, column='salary', method='std', k=None, chunksize=50_000):
+    """Copies the `source` CSV to `destination` without the outlier rows of `column`, in two passes.
+
+    Pass 1 reads only `column`: 'std' keeps a mergeable RunningStats summary, while the robust
+    methods ('mad', 'iqr') keep just that one float column to take medians/quantiles over.
+    Pass 2 streams the full rows and filters each chunk with a vectorized comparison.
+    Returns the (low, high) bounds and the number of rows removed.
+    """
+    if method == 'std':
+        summary = RunningStats()
+        for chunk in pd.read_csv(source, usecols=[column], chunksize=chunksize):
+            summary.update(chunk[column].to_numpy())
+    else:
+        summary = np.concatenate([
+            chunk[column].to_numpy(dtype='float64')
+            for chunk in pd.read_csv(source, usecols=[column], chunksize=chunksize)
+        ])
+    low, high = outlier_bounds(summary, method, k)
+
+    removed = 0
+    for number, chunk in enumerate(pd.read_csv(source, chunksize=chunksize)):
+        outlier = (chunk[column] < low) | (chunk[column] > high)
+        removed += int(outlier.sum())
+        chunk[~outlier].to_csv(destination, mode='w' if number == 0 else 'a', header=number == 0, index=False)
+
+    return (low, high), removed
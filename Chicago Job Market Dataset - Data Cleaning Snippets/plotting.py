@@ -0,0 +1,52 @@
+# Outlier plot for large job datasets.
+# `px.scatter` sends every salary row to the browser as SVG points, which stops being usable
+# at a few hundred thousand rows. This version aggregates on the server instead: one
+# WebGL (Scattergl) point per company with its quantile bands, plus the actual outlier rows,
+# so the figure size depends on the number of companies and outliers, not on the row count.
+
+import plotly.graph_objects as go
+
+# Above this many rows Outlier_Management.py switches from px.scatter to the aggregated plot
+AGGREGATE_ABOVE_ROWS = 50_000
+
+
+def aggregated_outlier_figure(df, outlier, max_companies=100, max_outliers=5_000):
+    """Per-company salary quantile bands (WebGL) with the outlier rows overlaid in red.
+
+    Only the `max_companies` companies with the most postings are drawn, and at most
+    `max_outliers` outlier points (a random sample if there are more).
+    """
+    non_outliers = df[~outlier]
+    by_company = non_outliers.groupby('company', observed=True)['salary']
+    bands = by_company.quantile([0.05, 0.25, 0.5, 0.75, 0.95]).unstack()
+    bands['count'] = by_company.size()
+    bands = bands.nlargest(max_companies, 'count')
+    companies = bands.index.astype(str)
+
+    outliers = df[outlier & df['company'].isin(bands.index)]
+    if len(outliers) > max_outliers:
+        outliers = outliers.sample(max_outliers, random_state=0)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=companies, y=bands[0.5], mode='markers', name='5th-95th percentile',
+        marker=dict(color='lightsteelblue', size=1),
+        error_y=dict(type='data', symmetric=False, array=bands[0.95] - bands[0.5],
+                     arrayminus=bands[0.5] - bands[0.05], thickness=1, width=0),
+        hoverinfo='skip'
+    ))
+    fig.add_trace(go.Scattergl(
+        x=companies, y=bands[0.5], mode='markers', name='Median (25th-75th percentile)',
+        marker=dict(color='steelblue', size=7),
+        error_y=dict(type='data', symmetric=False, array=bands[0.75] - bands[0.5],
+                     arrayminus=bands[0.5] - bands[0.25], thickness=6, width=0),
+        customdata=bands['count'], hovertemplate='%{x}<br>median %{y:,.0f}<br>%{customdata} postings<extra></extra>'
+    ))
+    fig.add_trace(go.Scattergl(
+        x=outliers['company'].astype(str), y=outliers['salary'], mode='markers', name='Outliers',
+        marker=dict(color='red'), text=outliers['positionName'],
+        hovertemplate='%{x}<br>%{text}<br>%{y:,.0f}<extra></extra>'
+    ))
+    fig.update_layout(title='Salaries of Job Positions with Outliers Highlighted',
+                      xaxis_title='Company', yaxis_title='Salary')
+    return fig
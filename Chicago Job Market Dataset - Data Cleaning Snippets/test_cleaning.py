@@ -0,0 +1,95 @@
+"""
+Checks the vectorized cleaning steps in cleaning.py against the original implementations they replace.
+Run with `python -m pytest` from this folder.
+"""
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import cleaning
+from cleaning import (column_dtypes, columns_to_keep, load_cleaned, normalize_strings, normalize_strings_map,
+                      parse_salary, parse_salary_apply, renamed_columns)
+
+INDEED_CSV = os.path.join(os.path.dirname(__file__), 'Indeed_tech jobs_chicago_2024.csv')
+
+
+def test_parse_salary_matches_apply_on_indeed_data():
+    salary = pd.read_csv(INDEED_CSV, usecols=['salary'])['salary']
+    pd.testing.assert_series_equal(parse_salary(salary), parse_salary_apply(salary))
+
+
+def test_parse_salary_matches_apply_on_edge_cases():
+    salary = pd.Series([
+        # missing -> NaN
+        np.nan, None, '', 'Not listed',
+        # hourly rates and ranges
+        '$40 an hour', '$40 - $50 an hour', '$17.50 an hour',
+        # around the <= 100 hourly cut-off
+        '$100 a year', '$100.5', 55.0, 0,
+        # yearly ranges, repeated (repeats share one parse)
+        '$125,000 - $135,000 a year', '$30,000 a month', '$125,000 - $135,000 a year',
+    ], index=range(10, 24), name='salary')
+    result = parse_salary(salary)
+
+    pd.testing.assert_series_equal(result, parse_salary_apply(salary))
+    assert result.isna().tolist()[:4] == [True] * 4
+    assert result.tolist()[4:7] == [80000.0, 90000.0, 35000.0]
+    assert result[21] == 130000.0
+
+
+def test_load_cleaned_hashes_the_source_only_when_it_changes(tmp_path, monkeypatch):
+    source = str(tmp_path / 'jobs.csv')
+    shutil.copy(INDEED_CSV, source)
+    cache_dir = str(tmp_path / 'cache')
+    hashed = []
+    file_digest = cleaning.file_digest
+    monkeypatch.setattr(cleaning, 'file_digest', lambda path: hashed.append(path) or file_digest(path))
+
+    first = load_cleaned(source, cache_dir)
+    pd.testing.assert_frame_equal(load_cleaned(source, cache_dir), first)
+    assert len(hashed) == 1
+
+    # A rewritten file (new size and mtime) is hashed again and cleaned into a new artifact
+    with open(source, 'a') as f:
+        f.write('\n')
+    load_cleaned(source, cache_dir)
+    assert len(hashed) == 2
+    assert len([name for name in os.listdir(cache_dir) if name.endswith('.parquet')]) == 2
+
+
+def indeed_frame():
+    df = pd.read_csv(INDEED_CSV, usecols=columns_to_keep, dtype=column_dtypes)[columns_to_keep]
+    df = df.rename(columns=renamed_columns)
+    df['Company Rating'] = df['Company Rating'].fillna("N/A")
+    return df
+
+
+def edge_case_frame():
+    return pd.DataFrame({
+        'text': ['  Mixed Case  ', '\tTABS\n', '', None, np.nan, 'already clean'],
+        # float ratings next to the "N/A" placeholder: only the strings change
+        'rating': [3.5, ' N/A ', 4.0, np.nan, 'N/A', 2.0],
+        'count': [1, 2, 3, 4, 5, 6],
+    }, index=range(5, 11))
+
+
+def as_objects(df):
+    # Arrow-backed columns hold <NA> where the df.map chain keeps None/NaN; compare the values only
+    return df.astype(object).where(df.notna(), None)
+
+
+def test_normalize_strings_matches_map():
+    for df in (indeed_frame(), edge_case_frame()):
+        pd.testing.assert_frame_equal(normalize_strings(df), normalize_strings_map(df))
+
+
+def test_arrow_normalize_strings_matches_map():
+    for df in (indeed_frame(), edge_case_frame()):
+        result = normalize_strings(df, arrow=True)
+        pd.testing.assert_frame_equal(as_objects(result), as_objects(normalize_strings_map(df)))
+
+    # Only all-string columns switch storage; mixed and numeric ones keep their dtype
+    assert result['text'].dtype == 'string[pyarrow]'
+    assert result['rating'].dtype == object and result['count'].dtype == 'int64'
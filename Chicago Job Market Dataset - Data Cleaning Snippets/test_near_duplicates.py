@@ -0,0 +1,67 @@
+"""
+Checks for near_duplicates.py: reposts are merged, distinct postings are kept.
+Run with `python -m pytest` from this folder.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from near_duplicates import drop_near_duplicates, find_near_duplicates
+
+INDEED_CSV = os.path.join(os.path.dirname(__file__), 'Indeed_tech jobs_chicago_2024.csv')
+
+# Shared company boilerplate, long enough that a one-word edit keeps the Jaccard similarity high
+BOILERPLATE = ' '.join(f'Acme builds reliable data products for partner number {i} across the midwest.'
+                       for i in range(30))
+
+
+def posting(company, title, description, date='2024-01-01'):
+    return {'company': company, 'positionName': title, 'description': description, 'Date Posted': date}
+
+
+def test_reposts_are_merged_into_the_first_posting():
+    df = pd.DataFrame([
+        posting('Acme', 'Data Engineer', BOILERPLATE, '2024-01-01'),
+        # same job reposted later, with the title padded and a word of the description edited
+        posting('Acme', ' data engineer', BOILERPLATE.replace('reliable', 'dependable', 1), '2024-01-08'),
+        posting('Acme', 'Data Engineer', BOILERPLATE, '2024-01-15'),
+    ], index=['a', 'b', 'c'])
+
+    assert find_near_duplicates(df, threshold=0.8).tolist() == ['a', 'a', 'a']
+    assert drop_near_duplicates(df, threshold=0.8).index.tolist() == ['a']
+
+
+def test_same_company_different_titles_are_kept():
+    df = pd.DataFrame([
+        posting('Acme', 'Data Scientist', BOILERPLATE),
+        posting('Acme', 'Sr. Data Scientist', BOILERPLATE),
+        posting('Other Co', 'Data Scientist', BOILERPLATE),
+    ])
+
+    assert find_near_duplicates(df, threshold=0.8).tolist() == [0, 1, 2]
+    # Blocking on the company alone merges them, which is why the title is part of the default
+    assert find_near_duplicates(df, threshold=0.8, same=('company',)).tolist() == [0, 0, 2]
+
+
+def test_missing_descriptions_never_match():
+    df = pd.DataFrame([
+        posting('Acme', 'Data Engineer', np.nan),
+        posting('Acme', 'Data Engineer', None),
+        posting('Acme', 'Data Engineer', ''),
+        posting('Acme', 'Data Engineer', '  ...  '),
+    ])
+
+    assert find_near_duplicates(df, threshold=0.5).tolist() == [0, 1, 2, 3]
+
+
+def test_indeed_keeps_distinct_roles_at_a_low_threshold():
+    df = pd.read_csv(INDEED_CSV)
+    kept = drop_near_duplicates(df, threshold=0.8)
+
+    cvs = kept.loc[kept['company'] == 'CVS Health', 'positionName'].tolist()
+    assert 'Data Scientist' in cvs and 'Sr. Data Scientist' in cvs
+    # Every dropped row is a repost of a kept one: same company and title
+    dropped = df.loc[df.index.difference(kept.index)]
+    assert dropped.set_index(['company', 'positionName']).index.isin(
+        kept.set_index(['company', 'positionName']).index).all()
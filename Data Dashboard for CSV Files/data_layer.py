@@ -0,0 +1,258 @@
+"""
+Data layer for the sales dashboard: fetching records from a Pinecone index (or loading a local
+CSV/Parquet export) into a DataFrame, and keeping it up to date between Streamlit reruns.
+Nothing in here depends on Streamlit, so it can be exercised against `LocalIndex`.
+"""
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from rollups import SalesRollup
+
+# The only columns the dashboard reads
+SALES_COLUMNS = ['SALES', 'QUANTITYORDERED', 'ORDERDATE', 'PRODUCTLINE', 'STATE']
+# Cells read as missing in local CSV exports (a subset of pd.read_csv's defaults)
+CSV_NULL_VALUES = ['', 'NA', 'N/A', 'NaN', 'nan', 'NULL', 'null']
+
+
+class LocalIndex:
+    """
+    In-memory stand-in for a Pinecone index handle (`pc.Index(...)`), for tests and local runs.
+    Records are (id, metadata) pairs; `query` ignores the vector and returns them in insertion order.
+    """
+
+    def __init__(self, records=()):
+        self.records = {str(record_id): dict(metadata) for record_id, metadata in records}
+
+    @classmethod
+    def from_csv(cls, path):
+        """Builds an index from a sales CSV, one record per row (ids are the row numbers)."""
+        df = pd.read_csv(path, encoding_errors='replace')
+        return cls((str(i), row) for i, row in enumerate(df.to_dict(orient='records')))
+
+    def upsert(self, records):
+        for record_id, metadata in records:
+            self.records[str(record_id)] = dict(metadata)
+
+    def query(self, vector=None, top_k=10, include_metadata=False, **kwargs):
+        matches = [
+            {'id': record_id, 'score': 0.0, 'metadata': metadata if include_metadata else None}
+            for record_id, metadata in list(self.records.items())[:top_k]
+        ]
+        return {'matches': matches}
+
+    def list(self, prefix=None, limit=100, namespace=''):
+        """Yields pages of ids, like `Index.list` on a serverless index."""
+        ids = [record_id for record_id in self.records if prefix is None or record_id.startswith(prefix)]
+        for start in range(0, len(ids), limit):
+            yield ids[start:start + limit]
+
+    def fetch(self, ids, namespace=''):
+        vectors = {
+            record_id: SimpleNamespace(id=record_id, metadata=self.records[record_id])
+            for record_id in ids if record_id in self.records
+        }
+        return SimpleNamespace(vectors=vectors, namespace=namespace)
+
+
+def records_to_frame(records):
+    """
+    Turns (id, metadata) pairs into the dashboard's DataFrame, coercing the numeric and date columns.
+    """
+    df = pd.DataFrame([metadata for _, metadata in records])
+    df.index = pd.Index([record_id for record_id, _ in records], name='id')
+    return coerce_sales_columns(df)
+
+
+def coerce_sales_columns(df):
+    """
+    Clean and preprocess data: numeric SALES/QUANTITYORDERED and datetime ORDERDATE.
+    """
+    if 'SALES' in df.columns:
+        df['SALES'] = pd.to_numeric(df['SALES'], errors='coerce')
+    if 'QUANTITYORDERED' in df.columns:
+        df['QUANTITYORDERED'] = pd.to_numeric(df['QUANTITYORDERED'], errors='coerce')
+    if 'ORDERDATE' in df.columns:
+        df['ORDERDATE'] = pd.to_datetime(df['ORDERDATE'], errors='coerce')
+    return df
+
+
+def load_local_sales(path, columns=SALES_COLUMNS, encoding='utf8'):
+    """
+    Loads a local CSV or Parquet sales export through PyArrow, reading only `columns`.
+    The file is memory-mapped rather than copied into the heap, text columns stay in Arrow
+    memory (string[pyarrow]) and the type coercion runs once here, so multi-GB exports
+    open quickly and with a small RSS.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    if path.endswith(('.parquet', '.pq')):
+        available = pq.read_schema(path).names
+        table = pq.read_table(path, columns=[c for c in columns if c in available], memory_map=True)
+    else:
+        with pa.memory_map(path) as source:
+            table = pa_csv.read_csv(
+                source,
+                read_options=pa_csv.ReadOptions(encoding=encoding),
+                # ORDERDATE stays a string here; pd.to_datetime handles the non-ISO formats below.
+                # Blank cells become nulls, as with pd.read_csv (PyArrow reads them as '' by default)
+                convert_options=pa_csv.ConvertOptions(include_columns=columns, include_missing_columns=False,
+                                                      column_types={'ORDERDATE': pa.string()},
+                                                      strings_can_be_null=True, null_values=CSV_NULL_VALUES)
+            )
+
+    df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+    return coerce_sales_columns(df)
+
+
+def query_records(index, top_k=1000, dimension=1536):
+    """
+    Fetches `top_k` (id, metadata) pairs from the index with a similarity query.
+    """
+    result = index.query(
+        vector=np.random.random(dimension).tolist(),  # Random vector for testing
+        top_k=top_k,
+        include_metadata=True
+    )
+    return [(match['id'], match['metadata']) for match in result['matches']]
+
+
+def export_records(index, skip_ids=(), page_size=100, workers=8, namespace='', stats=None):
+    """
+    Yields every (id, metadata) pair in the index, without a similarity search.
+    Ids are listed page by page and each page's metadata is fetched on a thread pool, so several
+    fetches are in flight while results stream out in the order the fetches complete (a slow page
+    does not hold back the ones after it). Ids in `skip_ids` are not fetched at all.
+    If a `stats` dict is given, it is filled with throughput metrics.
+    """
+    stats = {} if stats is None else stats
+    stats.update(records=0, pages=0, fetches=0, seconds=0.0, records_per_second=0.0)
+    start = time.perf_counter()
+
+    def fetch_page(ids):
+        response = index.fetch(ids=ids, namespace=namespace)
+        return [(record_id, vector.metadata or {}) for record_id, vector in response.vectors.items()]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        for page in index.list(limit=page_size, namespace=namespace):
+            stats['pages'] += 1
+            ids = [record_id for record_id in page if record_id not in skip_ids]
+            if ids:
+                in_flight.add(pool.submit(fetch_page, ids))
+                stats['fetches'] += 1
+
+            # Keep at most two fetches per worker queued, so memory stays bounded on huge indexes
+            while len(in_flight) >= workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    records = future.result()
+                    stats['records'] += len(records)
+                    yield from records
+
+        for future in as_completed(in_flight):
+            records = future.result()
+            stats['records'] += len(records)
+            yield from records
+
+    stats['seconds'] = time.perf_counter() - start
+    stats['records_per_second'] = stats['records'] / stats['seconds'] if stats['seconds'] else 0.0
+
+
+def _batched(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class SalesStore:
+    """
+    The dashboard's accumulated sales DataFrame. Each refresh appends only the delta:
+    with `full_export` (serverless indexes, which support listing ids), every record whose id has
+    not been seen yet; otherwise, through a `top_k` query, records whose ORDERDATE is not older
+    than the newest one held.
+    The chart aggregates in `rollup` are updated with the same delta.
+    One instance is shared by every Streamlit session, hence the lock.
+    """
+
+    def __init__(self):
+        self.df = pd.DataFrame()
+        self.rollup = SalesRollup()
+        self.last_seen = None  # newest ORDERDATE held so far
+        self.last_stats = {}  # throughput of the most recent full export
+        self.source_version = None  # (path, mtime, size) of the loaded local file
+        self.lock = threading.Lock()
+
+    def load_file(self, path):
+        """Replaces the data with a local export, unless that exact file version is already loaded."""
+        with self.lock:
+            stat = os.stat(path)
+            version = (path, stat.st_mtime_ns, stat.st_size)
+            if version == self.source_version:
+                return 0
+
+            start = time.perf_counter()
+            self.df = pd.DataFrame()
+            self.rollup = SalesRollup()
+            added = self._append([load_local_sales(path)])
+            seconds = time.perf_counter() - start
+            self.last_stats = {'records': added, 'pages': 1, 'fetches': 1, 'seconds': seconds,
+                               'records_per_second': added / seconds if seconds else 0.0}
+            self.source_version = version
+            return added
+
+    def refresh(self, index, top_k=1000, full_export=True):
+        """Pulls new records from `index` and returns how many were added."""
+        with self.lock:
+            if full_export:
+                return self._refresh_by_export(index)
+            return self._refresh_by_query(index, top_k)
+
+    def _refresh_by_export(self, index):
+        known = set(self.df.index)
+        stats = {}
+        # Records are turned into frames batch by batch as fetches complete, then joined once
+        frames = [
+            records_to_frame(batch)
+            for batch in _batched(export_records(index, skip_ids=known, stats=stats), 10_000)
+        ]
+        self.last_stats = stats
+        return self._append(frames)
+
+    def _refresh_by_query(self, index, top_k):
+        records = [
+            (record_id, metadata) for record_id, metadata in query_records(index, top_k)
+            if record_id not in self.df.index
+        ]
+        if not records:
+            return 0
+
+        new = records_to_frame(records)
+        if self.last_seen is not None and 'ORDERDATE' in new.columns:
+            new = new[new['ORDERDATE'] >= self.last_seen]
+        return self._append([new])
+
+    def _append(self, frames):
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return 0
+
+        added = sum(len(frame) for frame in frames)
+        for frame in frames:
+            self.rollup.update(frame)
+        self.df = pd.concat([self.df] + frames) if not self.df.empty else pd.concat(frames)
+        if 'ORDERDATE' in self.df.columns:
+            self.last_seen = self.df['ORDERDATE'].max()
+        return added
@@ -1,88 +1,112 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 from pinecone import Pinecone
 import os
 
+from data_layer import LocalIndex, SalesStore
+
 # Set your Pinecone API key in environment variables
 os.environ['PINECONE_API_KEY'] = 'YOUR_API_KEY'
 
-# Initialize Pinecone
-pc = Pinecone(api_key=os.environ['PINECONE_API_KEY'])
-
 # Define your index name
 index_name = "YOUR_INDEX_NAME"
 
+# A refresh is reused for this many seconds; after that, the next rerun fetches new records
+REFRESH_SECONDS = 300
 
-# Function to fetch data from Pinecone
-def fetch_all_data(top_k=1000):
+# Set DASHBOARD_DATA to a local .csv/.parquet sales export to read it instead of Pinecone
+local_data = os.environ.get('DASHBOARD_DATA')
+
+# True: page through every id in the (serverless) index and fetch the metadata in bulk.
+# False: sample `top_k` records with a similarity query (pod-based indexes cannot list ids).
+FULL_EXPORT = True
+
+
+@st.cache_resource
+def get_index():
     """
-    Fetches `top_k` results from the Pinecone index.
-    Returns a pandas DataFrame.
+    Returns the Pinecone index handle, created once per server process and shared by all sessions.
+    Set DASHBOARD_LOCAL_CSV to a sales CSV to run against a local stand-in index instead.
     """
-    try:
-        # Access Pinecone index
-        index = pc.Index(index_name)
-
-        # Query Pinecone for `top_k` results with metadata
-        result = index.query(
-            vector=np.random.random(1536).tolist(),  # Random vector for testing
-            top_k=top_k,
-            include_metadata=True
-        )
-
-        # Extract metadata from matches and return as DataFrame
-        data = [match['metadata'] for match in result['matches']]
-        df = pd.DataFrame(data)
-
-        # Clean and preprocess data
-        df['SALES'] = pd.to_numeric(df['SALES'], errors='coerce')
-        df['QUANTITYORDERED'] = pd.to_numeric(df['QUANTITYORDERED'], errors='coerce')
-        df['ORDERDATE'] = pd.to_datetime(df['ORDERDATE'], errors='coerce')
-        return df
+    local_csv = os.environ.get('DASHBOARD_LOCAL_CSV')
+    if local_csv:
+        return LocalIndex.from_csv(local_csv)
+
+    # Initialize Pinecone
+    pc = Pinecone(api_key=os.environ['PINECONE_API_KEY'])
+    return pc.Index(index_name)
+
+
+@st.cache_resource
+def get_store():
+    """
+    The accumulated sales data, kept across reruns so refreshes only add new records.
+    """
+    return SalesStore()
 
-    except Exception as e:
-        st.error(f"Error fetching data from Pinecone: {e}")
-        return pd.DataFrame()  # Return an empty DataFrame if an error occurs
+
+# Function to fetch data from Pinecone
+@st.cache_data(ttl=REFRESH_SECONDS, show_spinner=False)
+def fetch_all_data(top_k=1000, full_export=FULL_EXPORT):
+    """
+    Fetches the records not seen yet into the shared store (see SalesStore.refresh).
+    Returns the number of rows held. The DataFrame itself stays in the store: st.cache_data
+    would pickle it and hand every rerun a fresh copy. Errors are raised, not returned,
+    so a failed fetch is never cached.
+    """
+    store = get_store()
+    if local_data:
+        store.load_file(local_data)
+    else:
+        store.refresh(get_index(), top_k=top_k, full_export=full_export)
+    return len(store.df)
 
 
 # Function to display graphs and analysis
-def display_graphs(df):
+def display_graphs(rollup):
     """
-    Generates and displays graphs from the fetched data.
+    Displays graphs from the pre-aggregated totals (see rollups.py), so rendering
+    does not depend on how many raw rows have been fetched.
     """
- 
 
     # Total Sales by Product Line
-    if 'PRODUCTLINE' in df.columns and 'SALES' in df.columns:
-        product_sales = df.groupby('PRODUCTLINE')['SALES'].sum().sort_values(ascending=False)
+    if not rollup.product_sales.empty:
         st.write("Total Sales by Product Line:")
-        st.bar_chart(product_sales)
+        st.bar_chart(rollup.product_sales)
 
     # Quantity Ordered by State
-    if 'STATE' in df.columns and 'QUANTITYORDERED' in df.columns:
-        state_quantity = df.groupby('STATE')['QUANTITYORDERED'].sum().sort_values(ascending=False)
+    if not rollup.state_quantity.empty:
         st.write("Quantity Ordered by State:")
-        st.bar_chart(state_quantity)
+        st.bar_chart(rollup.state_quantity)
 
     # Sales over Time
-    if 'ORDERDATE' in df.columns and 'SALES' in df.columns:
-        sales_over_time = df.groupby(df['ORDERDATE'].dt.to_period('M'))['SALES'].sum()
+    if not rollup.monthly_sales.empty:
         st.write("Sales Over Time (Monthly):")
-        st.line_chart(sales_over_time)
+        st.line_chart(rollup.monthly_sales)
 
 
 # Streamlit App UI
 st.title("Real-Time Sales Data Dashboard")
-st.write("This dashboard fetches and visualizes real-time sales data from Pinecone.")
+st.write(f"This dashboard fetches and visualizes real-time sales data from {local_data or 'Pinecone'}.")
+
+if st.button("Refresh now"):
+    fetch_all_data.clear()
 
-# Fetch data automatically on load
+# Fetch data automatically on load (served from the cache until REFRESH_SECONDS have passed)
 with st.spinner("Fetching data from Pinecone..."):
-    df = fetch_all_data(top_k=1000)
+    try:
+        rows = fetch_all_data(top_k=1000)
+    except Exception as e:
+        st.error(f"Error fetching data from Pinecone: {e}")
+        # Keep showing what earlier refreshes fetched; the next rerun tries again
+        rows = len(get_store().df)
 
 # If data is fetched successfully, display graphs
-if not df.empty:
+if rows:
     st.success("Data fetched successfully!")
-    display_graphs(df)
+    stats = get_store().last_stats
+    if stats:
+        st.caption(f"Last export: {stats['records']:,} new records from {stats['pages']:,} id pages "
+                   f"in {stats['seconds']:.1f}s ({stats['records_per_second']:,.0f} records/s)")
+    display_graphs(get_store().rollup)
 else:
     st.error("No data fetched. Please check your Pinecone index or API key.")
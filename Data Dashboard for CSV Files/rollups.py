@@ -0,0 +1,35 @@
+"""
+Pre-aggregated series behind the dashboard charts.
+Instead of re-running the groupbys over every raw row on each render, the totals are updated
+once per batch of new records, so rendering only reads a few small Series.
+"""
+import pandas as pd
+
+
+class SalesRollup:
+    """
+    Running totals for the three dashboard charts:
+    sales by PRODUCTLINE, quantity ordered by STATE and monthly sales.
+    """
+
+    def __init__(self):
+        self.product_sales = pd.Series(dtype='float64', name='SALES')
+        self.state_quantity = pd.Series(dtype='float64', name='QUANTITYORDERED')
+        self.monthly_sales = pd.Series(dtype='float64', name='SALES')
+        self.rows = 0
+
+    def update(self, df):
+        """Folds a batch of new records into the totals (each record must be passed only once)."""
+        if 'PRODUCTLINE' in df.columns and 'SALES' in df.columns:
+            batch = df.groupby('PRODUCTLINE')['SALES'].sum()
+            self.product_sales = self.product_sales.add(batch, fill_value=0).sort_values(ascending=False)
+
+        if 'STATE' in df.columns and 'QUANTITYORDERED' in df.columns:
+            batch = df.groupby('STATE')['QUANTITYORDERED'].sum()
+            self.state_quantity = self.state_quantity.add(batch, fill_value=0).sort_values(ascending=False)
+
+        if 'ORDERDATE' in df.columns and 'SALES' in df.columns:
+            batch = df.groupby(df['ORDERDATE'].dt.to_period('M'))['SALES'].sum()
+            self.monthly_sales = self.monthly_sales.add(batch, fill_value=0).sort_index()
+
+        self.rows += len(df)
@@ -0,0 +1,108 @@
+"""
+Checks for data_layer.py against the in-memory LocalIndex (no Pinecone or Streamlit needed).
+Run with `python -m pytest` from this folder.
+"""
+import threading
+
+import pandas as pd
+
+from data_layer import LocalIndex, SalesStore, export_records, load_local_sales
+
+
+def sale(day, product, state, sales, quantity):
+    return {'ORDERDATE': f'2024-01-{day:02d}', 'PRODUCTLINE': product, 'STATE': state,
+            'SALES': sales, 'QUANTITYORDERED': quantity}
+
+
+def assert_rollup_matches(store):
+    df = store.df
+    rollup = store.rollup
+    pd.testing.assert_series_equal(
+        rollup.product_sales.sort_index(), df.groupby('PRODUCTLINE')['SALES'].sum().sort_index(),
+        check_names=False, check_index_type=False
+    )
+    pd.testing.assert_series_equal(
+        rollup.state_quantity.sort_index(), df.groupby('STATE')['QUANTITYORDERED'].sum().astype('float64').sort_index(),
+        check_names=False, check_index_type=False
+    )
+    pd.testing.assert_series_equal(
+        rollup.monthly_sales.sort_index(), df.groupby(df['ORDERDATE'].dt.to_period('M'))['SALES'].sum().sort_index(),
+        check_names=False, check_index_type=False
+    )
+    assert rollup.rows == len(df)
+
+
+def test_full_export_adds_only_unseen_records():
+    index = LocalIndex([
+        ('1', sale(1, 'Cars', 'CA', 100.0, 1)),
+        ('2', sale(2, 'Ships', 'NY', 250.0, 3)),
+        ('3', sale(3, 'Cars', 'NY', 50.0, 2)),
+    ])
+    store = SalesStore()
+
+    assert store.refresh(index) == 3
+    assert store.refresh(index) == 0
+
+    index.upsert([('4', sale(4, 'Planes', 'CA', 75.0, 5)), ('5', sale(5, 'Cars', 'CA', 20.0, 1))])
+    assert store.refresh(index) == 2
+    assert sorted(store.df.index) == ['1', '2', '3', '4', '5']
+    assert store.last_stats['records'] == 2
+    assert_rollup_matches(store)
+
+
+def test_query_refresh_adds_only_newer_records():
+    index = LocalIndex([
+        ('1', sale(10, 'Cars', 'CA', 100.0, 1)),
+        ('2', sale(12, 'Ships', 'NY', 250.0, 3)),
+    ])
+    store = SalesStore()
+
+    assert store.refresh(index, full_export=False) == 2
+    assert store.refresh(index, full_export=False) == 0
+
+    # An unseen id dated before the newest record held is skipped; a newer one is added
+    index.upsert([('3', sale(5, 'Cars', 'NY', 40.0, 2)), ('4', sale(20, 'Planes', 'CA', 75.0, 4))])
+    assert store.refresh(index, full_export=False) == 1
+    assert sorted(store.df.index) == ['1', '2', '4']
+    assert store.last_seen == pd.Timestamp('2024-01-20')
+    assert_rollup_matches(store)
+
+
+class SlowFirstPageIndex(LocalIndex):
+    """LocalIndex whose fetch of id '0' blocks until every other page has been fetched."""
+
+    def __init__(self, records):
+        super().__init__(records)
+        self.others_done = threading.Event()
+        self.fetched = 0
+
+    def fetch(self, ids, namespace=''):
+        if '0' in ids:
+            self.others_done.wait(timeout=5)
+        else:
+            self.fetched += 1
+            if self.fetched == len(self.records) - 1:
+                self.others_done.set()
+        return super().fetch(ids, namespace)
+
+
+def test_export_streams_records_as_fetches_complete():
+    index = SlowFirstPageIndex((str(i), sale(1, 'Cars', 'CA', 1.0, 1)) for i in range(8))
+    exported = [record_id for record_id, _ in export_records(index, page_size=1, workers=4)]
+
+    assert sorted(exported) == [str(i) for i in range(8)]
+    # The slow first page comes out last instead of holding back the finished ones
+    assert exported[-1] == '0'
+
+
+def test_local_csv_blank_cells_are_missing(tmp_path):
+    path = tmp_path / 'sales.csv'
+    path.write_text('ORDERDATE,PRODUCTLINE,STATE,SALES,QUANTITYORDERED\n'
+                    '2024-01-01,Cars,,100.0,1\n'
+                    '2024-01-02,Ships,NY,,3\n')
+    df = load_local_sales(str(path))
+
+    assert df['STATE'].isna().tolist() == [True, False]
+    assert df['SALES'].isna().tolist() == [False, True]
+    # Missing states drop out of the state rollup instead of forming a '' group
+    assert df.groupby('STATE')['QUANTITYORDERED'].sum().index.tolist() == ['NY']
@@ -0,0 +1,841 @@
+"""AI slop detector: the notebook's detection engines as an importable module and corpus CLI.
+
+Score a corpus (JSONL or CSV, one document per line/row) and write one verdict per line:
+
+    python ai_slop_detector.py corpus.jsonl verdicts.jsonl --workers 4
+
+The output file doubles as the checkpoint: re-running the same command after a crash
+skips every document that already has a verdict and appends the rest.
+
+On CPU-only workers, --backend int8/onnx/onnx-int8 swaps the fp32 referee for a quantized or
+ONNX Runtime one; add --check-accuracy 50 to verify it against fp32 before the run starts.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+import unicodedata
+from multiprocessing import get_context
+
+import numpy as np
+import torch
+import nltk
+import spacy
+from nltk.tokenize import sent_tokenize
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+MODEL_ID = "openai-community/gpt2"
+
+# Known over-indexed vocabulary identified in instruction-tuned outputs
+OVERINDEXED_VOCAB = {
+    "camaraderie", "tapestry", "intricate", "palpable", "amidst",
+    "solace", "vibrant", "cacophony", "underscore", "unspoken",
+    "fleeting", "unravel", "poignant", "testament", "beacon"
+}
+
+# Standard downtoners in the English language
+DOWNTONERS = {"barely", "nearly", "almost", "hardly", "scarcely", "partially"}
+
+# Pipeline components none of the rhetorical counters read (they only need tags, lemmas and heads)
+UNUSED_PIPES = ["ner"]
+
+# Scoring backends for the GPT-2 referee:
+#   torch      - fp32 PyTorch model (the notebook's baseline, uses CUDA when available)
+#   int8       - PyTorch model with dynamically int8-quantized Linear layers (CPU)
+#   onnx       - fp32 graph exported to ONNX and run by ONNX Runtime (CPU)
+#   onnx-int8  - the ONNX graph with dynamically int8-quantized weights (CPU)
+BACKENDS = ("torch", "int8", "onnx", "onnx-int8")
+
+# Where the onnx/onnx-int8 backends keep their exported graphs (--onnx-dir)
+ONNX_DIR = "onnx"
+
+# Rough peak RSS of one worker process (GPT-2, spaCy and torch's own buffers), used to size --workers
+WORKER_MEMORY = 1.5 * 2**30
+
+# Loaded lazily (once per process) by load_resources()
+nlp = None
+tokenizer = None
+referee = None
+backend = None
+device = 'cuda' if torch.cuda.is_available() else 'cpu'
+
+
+class _LogitsOnly(torch.nn.Module):
+    """Wraps the causal LM so tracing for ONNX export sees plain tensors in and logits out."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask, use_cache=False).logits
+
+
+def _conv1d_to_linear(module):
+    # GPT-2 implements its projections with transformers' Conv1D (a transposed Linear),
+    # which quantize_dynamic does not recognise, so swap them for real Linear layers first
+    from transformers.pytorch_utils import Conv1D
+
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            linear = torch.nn.Linear(child.weight.shape[0], child.nf)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, name, linear)
+        else:
+            _conv1d_to_linear(child)
+    return module
+
+
+def _write_atomically(path, write):
+    # Write to a private temp file, then rename it into place: a concurrent reader sees either
+    # no file or the complete one, never a half-written graph
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def prepare_onnx(model_id=MODEL_ID, backend="onnx", onnx_dir=ONNX_DIR, model=None):
+    """Exports (and for onnx-int8, quantizes) the ONNX graph unless it already exists; returns its path.
+
+    score_corpus calls this once in the parent before starting workers, so they only ever load it."""
+    os.makedirs(onnx_dir, exist_ok=True)
+    onnx_path = os.path.join(onnx_dir, model_id.replace("/", "_") + ".onnx")
+    if not os.path.exists(onnx_path):
+        if model is None:
+            model = AutoModelForCausalLM.from_pretrained(model_id)
+            model.eval()
+        dummy = torch.ones((1, 8), dtype=torch.long)
+        dynamic = {0: "batch", 1: "sequence"}
+        _write_atomically(onnx_path, lambda path: torch.onnx.export(
+            _LogitsOnly(model), (dummy, dummy), path,
+            input_names=["input_ids", "attention_mask"], output_names=["logits"],
+            dynamic_axes={"input_ids": dynamic, "attention_mask": dynamic, "logits": dynamic},
+            opset_version=14
+        ))
+
+    if backend == "onnx-int8":
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantized_path = onnx_path.replace(".onnx", ".int8.onnx")
+        if not os.path.exists(quantized_path):
+            _write_atomically(quantized_path,
+                              lambda path: quantize_dynamic(onnx_path, path, weight_type=QuantType.QInt8))
+        onnx_path = quantized_path
+    return onnx_path
+
+
+def build_referee(model_id=MODEL_ID, backend="torch", onnx_dir=ONNX_DIR):
+    """Returns (forward, device) where forward(input_ids, attention_mask) gives float logits for the backend."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+
+    model = AutoModelForCausalLM.from_pretrained(model_id)
+    model.eval()
+
+    if backend == "torch":
+        model = model.to(device)
+        return (lambda input_ids, attention_mask:
+                model(input_ids=input_ids, attention_mask=attention_mask).logits.float()), device
+
+    if backend == "int8":
+        model = torch.ao.quantization.quantize_dynamic(_conv1d_to_linear(model), {torch.nn.Linear}, dtype=torch.qint8)
+        return (lambda input_ids, attention_mask:
+                model(input_ids=input_ids, attention_mask=attention_mask).logits.float()), 'cpu'
+
+    import onnxruntime as ort
+
+    onnx_path = prepare_onnx(model_id, backend, onnx_dir, model)
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = torch.get_num_threads()
+    session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+
+    def forward(input_ids, attention_mask):
+        logits = session.run(["logits"], {
+            "input_ids": input_ids.numpy(),
+            "attention_mask": attention_mask.numpy()
+        })[0]
+        return torch.from_numpy(logits).float()
+
+    return forward, 'cpu'
+
+
+def load_text_tools(model_id=MODEL_ID):
+    """Loads the spaCy parser, the NLTK sentence tokenizer and the GPT-2 tokenizer once per process."""
+    global nlp, tokenizer
+    if nlp is None:
+        nltk.download('punkt', quiet=True)
+        nlp = spacy.load("en_core_web_sm", exclude=UNUSED_PIPES)
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+
+
+def load_resources(model_id=MODEL_ID, backend_name=None, onnx_dir=ONNX_DIR):
+    """Loads the text tools and the GPT-2 referee once per process.
+
+    backend_name=None keeps whichever referee is already loaded (torch if none is); only an
+    explicit, different backend replaces it."""
+    global referee, backend, device
+    load_text_tools(model_id)
+
+    if referee is None or (backend_name is not None and backend != backend_name):
+        backend_name = backend_name or "torch"
+        referee, device = build_referee(model_id, backend_name, onnx_dir)
+        backend = backend_name
+
+
+def check_backend_accuracy(sentences, backend_name, tolerance=0.05, batch_size=16, model_id=MODEL_ID,
+                           onnx_dir=ONNX_DIR):
+    """Scores sentences with the fp32 baseline and with backend_name, and compares perplexities and latency.
+
+    The report's "passed" is True when every perplexity is within `tolerance` relative error of fp32.
+    Both referees are built here and dropped afterwards; the process-wide one is left untouched."""
+    load_text_tools(model_id)
+
+    perplexities = {}
+    latency_ms = {}
+    for name in ("torch", backend_name):
+        forward, on = build_referee(model_id, name, onnx_dir)
+        start = time.perf_counter()
+        records = batched_sentence_perplexity(sentences, batch_size=batch_size, forward=forward, on=on)
+        latency_ms[name] = (time.perf_counter() - start) * 1000 / len(sentences)
+        perplexities[name] = np.array([record["perplexity"] for record in records])
+
+    relative_error = np.abs(perplexities[backend_name] - perplexities["torch"]) / perplexities["torch"]
+    return {
+        "backend": backend_name,
+        "sentences": len(sentences),
+        "max_relative_error": float(relative_error.max()),
+        "mean_relative_error": float(relative_error.mean()),
+        "baseline_ms_per_sentence": latency_ms["torch"],
+        "backend_ms_per_sentence": latency_ms[backend_name],
+        "passed": bool(relative_error.max() <= tolerance),
+    }
+
+
+def _rhetorical_metrics(doc):
+    """Builds every rhetorical counter in a single pass over the tokens of a parsed doc."""
+    total_words = 0
+    total_word_length = 0
+    nominalizations = 0
+    present_participles = 0
+    infinitives = 0
+    prep_phrases = 0
+    downtoners = 0
+    coordinations = 0
+    found_overindexed = 0
+
+    for t in doc:
+        if t.is_alpha:
+            total_words += 1
+            total_word_length += len(t.text)
+
+        pos = t.pos_
+        lemma = t.lemma_.lower()
+        if pos == "NOUN" and t.text.lower().endswith(("tion", "ment", "ness", "ity", "ance", "ence")):
+            nominalizations += 1
+        elif pos == "VERB" and t.tag_ == "VBG":
+            present_participles += 1
+        elif pos == "ADP":
+            prep_phrases += 1
+        elif pos == "CCONJ":
+            coordinations += 1
+
+        if t.tag_ == "TO" and t.head.pos_ == "VERB":
+            infinitives += 1
+        if lemma in DOWNTONERS:
+            downtoners += 1
+        if lemma in OVERINDEXED_VOCAB:
+            found_overindexed += 1
+
+    if total_words == 0:
+        return {}
+
+    return {
+        "word_count": total_words,
+        "mean_word_length": total_word_length / total_words,
+        "nominalization_rate": (nominalizations / total_words) * 100,
+        "participle_rate": (present_participles / total_words) * 100,
+        "infinitive_rate": (infinitives / total_words) * 100,
+        "prep_phrase_rate": (prep_phrases / total_words) * 100,
+        "downtoner_count": downtoners,
+        "coordination_rate": (coordinations / total_words) * 100,
+        "overindexed_count": found_overindexed
+    }
+
+
+def analyze_rhetorical_features(text):
+    """ENGINE 1: Parses text for grammatical structures heavily favored by instruction tuning."""
+    load_resources()
+    return _rhetorical_metrics(nlp(text))
+
+
+def analyze_rhetorical_features_stream(texts, batch_size=64, n_process=1):
+    """ENGINE 1 (streaming): Yields one metrics dict per text, parsing them in batches with nlp.pipe.
+
+    n_process > 1 forks spaCy workers; leave it at 1 inside the CLI's own process pool."""
+    load_resources()
+    for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+        yield _rhetorical_metrics(doc)
+
+
+def sentence_perplexity_loop(sentences):
+    """ENGINE 2 (baseline): One batch-size-1 GPT-2 forward pass per sentence."""
+    sentence_records = []
+
+    for sentence in sentences:
+        inputs = tokenizer(sentence, return_tensors="pt").to(device)
+
+        with torch.no_grad():
+            logits = referee(inputs["input_ids"], inputs["attention_mask"])
+            loss = torch.nn.functional.cross_entropy(logits[0, :-1], inputs["input_ids"][0, 1:])
+
+        perplexity = math.exp(loss.item())
+        sentence_records.append({
+            "sentence": sentence,
+            "perplexity": perplexity
+        })
+    return sentence_records
+
+
+def batched_sentence_perplexity(sentences, batch_size=16, forward=None, on=None):
+    """ENGINE 2 (batched): Scores length-bucketed, padded sentences with one forward pass per batch.
+
+    forward/on override the loaded referee and its device (used to compare backends)."""
+    forward = forward or referee
+    on = on or device
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+
+    encoded = [tokenizer(sentence)["input_ids"] for sentence in sentences]
+
+    # Sorting by token length keeps the padding (wasted compute) inside every batch small
+    order = sorted(range(len(sentences)), key=lambda i: len(encoded[i]))
+    perplexities = [0.0] * len(sentences)
+
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        max_len = max(len(encoded[i]) for i in bucket)
+
+        input_ids = torch.full((len(bucket), max_len), tokenizer.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(bucket), max_len), dtype=torch.long)
+        for row, i in enumerate(bucket):
+            input_ids[row, :len(encoded[i])] = torch.tensor(encoded[i])
+            attention_mask[row, :len(encoded[i])] = 1
+        input_ids = input_ids.to(on)
+        attention_mask = attention_mask.to(on)
+
+        with torch.no_grad():
+            logits = forward(input_ids, attention_mask)
+
+        # Same shift as the model's built-in loss: token t predicts token t+1, padding is masked out
+        shift_logits = logits[:, :-1, :]
+        shift_labels = input_ids[:, 1:]
+        shift_mask = attention_mask[:, 1:].float()
+        token_loss = torch.nn.functional.cross_entropy(shift_logits.transpose(1, 2), shift_labels, reduction="none")
+        sentence_loss = (token_loss * shift_mask).sum(dim=1) / shift_mask.sum(dim=1)
+
+        for row, i in enumerate(bucket):
+            perplexities[i] = math.exp(sentence_loss[row].item())
+
+    return [
+        {"sentence": sentence, "perplexity": perplexity}
+        for sentence, perplexity in zip(sentences, perplexities)
+    ]
+
+
+class PerplexityCache:
+    """Persistent sentence -> perplexity cache backed by SQLite, with LRU eviction and hit/miss counters.
+
+    Keys are sha256(model id + normalized sentence), so boilerplate repeated across documents
+    (disclaimers, signatures, templated intros) costs one lookup instead of a forward pass.
+    Several worker processes may share the same file.
+    """
+
+    def __init__(self, path, model_id=MODEL_ID, max_entries=1_000_000):
+        self.model_id = model_id
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS perplexity "
+            "(key TEXT PRIMARY KEY, perplexity REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS perplexity_last_used ON perplexity (last_used)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self.conn.commit()
+
+    def key(self, sentence):
+        # Whitespace and Unicode-form differences do not change what GPT-2 sees in any meaningful way
+        normalized = " ".join(unicodedata.normalize("NFC", sentence).split())
+        return hashlib.sha256(f"{self.model_id}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def get_many(self, sentences):
+        """Returns {sentence: perplexity} for the cached sentences and refreshes their LRU timestamp."""
+        keys = {self.key(sentence): sentence for sentence in sentences}
+        found = {}
+        key_list = list(keys)
+        # SQLite caps the number of bound parameters per statement
+        for start in range(0, len(key_list), 500):
+            chunk = key_list[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT key, perplexity FROM perplexity WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            for key, perplexity in rows:
+                found[keys[key]] = perplexity
+
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE perplexity SET last_used = ? WHERE key = ?",
+                [(now, self.key(sentence)) for sentence in found]
+            )
+            self._count(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def put_many(self, records):
+        """Stores {sentence: perplexity} pairs, then evicts least recently used entries over max_entries."""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO perplexity (key, perplexity, last_used) VALUES (?, ?, ?)",
+                [(self.key(sentence), perplexity, now) for sentence, perplexity in records.items()]
+            )
+            overflow = self.conn.execute("SELECT COUNT(*) FROM perplexity").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self.conn.execute(
+                    "DELETE FROM perplexity WHERE key IN "
+                    "(SELECT key FROM perplexity ORDER BY last_used LIMIT ?)", (overflow,)
+                )
+
+    def _count(self, hits, misses):
+        self.hits += hits
+        self.misses += misses
+        # Also kept on disk so runs sharded across processes can report one total
+        self.conn.executemany(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            [("hits", hits), ("misses", misses)]
+        )
+
+    def stats(self):
+        """Returns the persisted totals: entries, hits, misses and hit rate."""
+        counters = dict(self.conn.execute("SELECT name, value FROM counters").fetchall())
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "entries": self.conn.execute("SELECT COUNT(*) FROM perplexity").fetchone()[0],
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+def cached_sentence_perplexity(sentences, cache, batch_size=16):
+    """ENGINE 2 (cached): Looks sentences up in a PerplexityCache and only scores the misses."""
+    known = cache.get_many(sentences)
+    # Repeats inside the same document are scored once as well
+    missing = list(dict.fromkeys(sentence for sentence in sentences if sentence not in known))
+
+    if missing:
+        scored = {
+            record["sentence"]: record["perplexity"]
+            for record in batched_sentence_perplexity(missing, batch_size=batch_size or 1)
+        }
+        cache.put_many(scored)
+        known.update(scored)
+
+    return [{"sentence": sentence, "perplexity": known[sentence]} for sentence in sentences]
+
+
+def _sentence_spans(text, sentences):
+    """Returns the (start, end) character span of each sentence in text, or None where it cannot be found."""
+    spans = []
+    position = 0
+    for sentence in sentences:
+        start = text.find(sentence, position)
+        if start == -1:
+            spans.append(None)
+            continue
+        spans.append((start, start + len(sentence)))
+        position = start + len(sentence)
+    return spans
+
+
+def sliding_window_sentence_perplexity(text, sentences, stride=512, batch_size=16, window_batch_size=1):
+    """ENGINE 2 (long documents): Scores the whole text with a strided sliding window, then maps
+    token losses back onto sentence spans.
+
+    The text is tokenized once and every token is predicted from up to GPT-2's full context, so a
+    multi-page document costs a handful of forward passes instead of one per sentence.
+
+    Windows are batched separately from sentences (`window_batch_size`): the logits of one full
+    1024-token window already take ~200 MB in fp32, so sentence-sized batches of them would need
+    gigabytes. `batch_size` only applies to sentences scored on their own."""
+    max_length = min(tokenizer.model_max_length, 1024)
+    stride = min(stride, max_length)
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+
+    encoding = tokenizer(text, return_offsets_mapping=True)
+    input_ids = encoding["input_ids"]
+    offsets = encoding["offset_mapping"]
+    token_nll = [None] * len(input_ids)
+
+    # Every window starts `stride` tokens after the previous one; only the tokens the previous
+    # window did not reach are scored, the overlap just provides left context
+    windows = []
+    prev_end = 0
+    for begin in range(0, len(input_ids), stride):
+        end = min(begin + max_length, len(input_ids))
+        windows.append((begin, end, prev_end))
+        prev_end = end
+        if end == len(input_ids):
+            break
+
+    for start in range(0, len(windows), window_batch_size):
+        group = windows[start:start + window_batch_size]
+        width = max(end - begin for begin, end, _ in group)
+
+        ids = torch.full((len(group), width), tokenizer.pad_token_id, dtype=torch.long)
+        mask = torch.zeros((len(group), width), dtype=torch.long)
+        for row, (begin, end, _) in enumerate(group):
+            ids[row, :end - begin] = torch.tensor(input_ids[begin:end])
+            mask[row, :end - begin] = 1
+
+        with torch.no_grad():
+            logits = referee(ids.to(device), mask.to(device))
+        losses = torch.nn.functional.cross_entropy(
+            logits[:, :-1, :].transpose(1, 2), ids[:, 1:].to(device), reduction="none"
+        ).cpu()
+        del logits  # free the (rows, width, vocab) tensor before the next window is scored
+
+        for row, (begin, end, scored_until) in enumerate(group):
+            for i in range(max(scored_until, begin + 1), end):
+                token_nll[i] = losses[row, i - begin - 1].item()
+
+    # Token 0 has no left context and stays unscored; every other token belongs to the sentence
+    # whose span contains its first character
+    spans = _sentence_spans(text, sentences)
+    sentence_nll = [[] for _ in sentences]
+    order = sorted((span[0], span[1], index) for index, span in enumerate(spans) if span is not None)
+    cursor = 0
+    for i, (char_start, _) in enumerate(offsets):
+        while cursor < len(order) and order[cursor][1] <= char_start:
+            cursor += 1
+        if cursor < len(order) and order[cursor][0] <= char_start and token_nll[i] is not None:
+            sentence_nll[order[cursor][2]].append(token_nll[i])
+
+    # Sentences punkt normalized beyond recognition (or made only of token 0) are scored on their own
+    unmatched = [sentence for sentence, nll in zip(sentences, sentence_nll) if not nll]
+    isolated = {
+        record["sentence"]: record["perplexity"]
+        for record in batched_sentence_perplexity(unmatched, batch_size=batch_size)
+    } if unmatched else {}
+
+    return [
+        {"sentence": sentence, "perplexity": math.exp(sum(nll) / len(nll)) if nll else isolated[sentence]}
+        for sentence, nll in zip(sentences, sentence_nll)
+    ]
+
+
+def comprehensive_slop_detector(text, batch_size=16, rhetorical_metrics=None, cache=None, mode="sentence"):
+    """MAIN PIPELINE: Combines Rhetorical Density (Engine 1) with Statistical Physics (Engine 2).
+
+    Set batch_size=None to fall back to the one-sentence-at-a-time loop. Pass rhetorical_metrics
+    when Engine 1 already ran (e.g. through analyze_rhetorical_features_stream), and a
+    PerplexityCache to skip forward passes for sentences seen before. mode="window" scores the
+    whole document with a sliding window instead of each sentence in isolation (the cache is not
+    used there, since a sentence's perplexity then depends on its context)."""
+    load_resources()
+
+    # 1. Run Engine 1: Morphosyntactic Analysis
+    if rhetorical_metrics is None:
+        rhetorical_metrics = analyze_rhetorical_features(text)
+
+    # 2. Run Engine 2: Statistical Perplexity Evaluation
+    sentences = [sentence for sentence in sent_tokenize(text) if len(sentence.strip()) >= 10]
+
+    if not sentences:
+        sentence_records = []
+    elif mode == "window":
+        sentence_records = sliding_window_sentence_perplexity(text, sentences, batch_size=batch_size or 1)
+    elif cache is not None:
+        sentence_records = cached_sentence_perplexity(sentences, cache, batch_size=batch_size)
+    elif batch_size:
+        sentence_records = batched_sentence_perplexity(sentences, batch_size=batch_size)
+    else:
+        sentence_records = sentence_perplexity_loop(sentences)
+
+    if not sentence_records:
+        return None
+
+    all_ppl = [record["perplexity"] for record in sentence_records]
+
+    return {
+        "statistical": {
+            "mean_perplexity": np.mean(all_ppl),
+            "burstiness": np.std(all_ppl),
+            "slop_floor": np.min(all_ppl),
+            "sentence_breakdown": sentence_records
+        },
+        "rhetorical": rhetorical_metrics
+    }
+
+
+def classify_analysis(analysis):
+    """The Final Verdict Engine, applied to an existing comprehensive_slop_detector() result."""
+    stat = analysis["statistical"]
+    rhet = analysis["rhetorical"]
+
+    slop_score = 0
+    flags = []
+
+    # 1. Evaluate Statistical Conformity
+    if stat["mean_perplexity"] < 60:
+        slop_score += 2
+        flags.append(f"Low Perplexity ({stat['mean_perplexity']:.1f})")
+
+    if stat["burstiness"] < 20:
+        slop_score += 1
+        flags.append(f"Low Structural Burstiness ({stat['burstiness']:.1f})")
+
+    # 2. Evaluate Rhetorical Density
+    if rhet.get("nominalization_rate", 0) > 4.0:
+        slop_score += 1
+        flags.append(f"High Nominalization Rate ({rhet['nominalization_rate']:.1f}%)")
+
+    if rhet.get("participle_rate", 0) > 3.0:
+        slop_score += 1
+        flags.append(f"High Participle Rate ({rhet['participle_rate']:.1f}%)")
+
+    if rhet.get("overindexed_count", 0) > 0:
+        slop_score += 2
+        flags.append("Over-indexed Vocabulary Detected")
+
+    # 3. The Decision Boundary
+    if slop_score >= 4:
+        verdict = "HIGH PROBABILITY: AI SLOP"
+    elif slop_score >= 2:
+        verdict = "MIXED: HEAVILY EDITED HUMAN OR HYBRID"
+    else:
+        verdict = "HIGH PROBABILITY: HUMAN"
+
+    return verdict, flags
+
+
+def classify_text(text):
+    """The Final Verdict Engine."""
+    analysis = comprehensive_slop_detector(text)
+    if not analysis:
+        return "ERROR: Text too short for reliable analysis."
+    return classify_analysis(analysis)
+
+
+# ---------------------------------------------------------------------------
+# Corpus scoring CLI
+# ---------------------------------------------------------------------------
+
+def read_corpus(path, text_field="text", id_field="id"):
+    """Yields (doc_id, text) pairs from a JSONL or CSV corpus. Missing ids fall back to the row number."""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            # The csv module rejects fields over 128 KiB by default, and long documents are common
+            csv.field_size_limit(2**31 - 1)
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+
+        for row_number, row in enumerate(rows):
+            doc_id = row.get(id_field)
+            yield str(doc_id if doc_id not in (None, '') else row_number), row.get(text_field) or ''
+
+
+def load_checkpoint(output_path):
+    """Returns the ids already scored in output_path, dropping a half-written last line if the run was killed."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+            data = data[:data.rfind(b'\n') + 1]
+
+    for line in data.decode('utf-8').splitlines():
+        if line.strip():
+            done.add(json.loads(line)["id"])
+    return done
+
+
+def score_document(doc_id, text, rhetorical_metrics=None):
+    """Runs the full pipeline on one document and returns a JSON-serializable verdict record."""
+    analysis = comprehensive_slop_detector(text, rhetorical_metrics=rhetorical_metrics,
+                                           cache=perplexity_cache, mode=perplexity_mode)
+    if not analysis:
+        return {"id": doc_id, "verdict": "ERROR: Text too short for reliable analysis.", "flags": []}
+
+    verdict, flags = classify_analysis(analysis)
+    stat = analysis["statistical"]
+    return {
+        "id": doc_id,
+        "verdict": verdict,
+        "flags": flags,
+        "mean_perplexity": float(stat["mean_perplexity"]),
+        "burstiness": float(stat["burstiness"]),
+        "slop_floor": float(stat["slop_floor"]),
+        "rhetorical": {key: float(value) for key, value in analysis["rhetorical"].items()},
+    }
+
+
+# Set per process by _init_worker() from the CLI's --cache and --mode
+perplexity_cache = None
+perplexity_mode = "sentence"
+
+
+def _init_worker(threads, cache_path=None, cache_size=1_000_000, backend_name="torch", mode="sentence",
+                 onnx_dir=ONNX_DIR):
+    global perplexity_cache, perplexity_mode
+    perplexity_mode = mode
+    # Each worker owns its own model copy, so split the cores instead of letting every
+    # worker's intra-op pool fight over all of them
+    torch.set_num_threads(threads)
+    load_resources(backend_name=backend_name, onnx_dir=onnx_dir)
+    if cache_path:
+        # Quantized backends give slightly different perplexities, so they get their own keys
+        perplexity_cache = PerplexityCache(cache_path, model_id=f"{MODEL_ID}:{backend_name}", max_entries=cache_size)
+
+
+def _score_batch(batch):
+    texts = [text for _, text in batch]
+    rhetorical = analyze_rhetorical_features_stream(texts, batch_size=len(texts))
+    return [
+        score_document(doc_id, text, rhetorical_metrics=metrics)
+        for (doc_id, text), metrics in zip(batch, rhetorical)
+    ]
+
+
+def _batches(documents, size):
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def default_workers():
+    """One worker per core, but no more than the available memory fits (each loads its own GPT-2 and spaCy)."""
+    cores = os.cpu_count() or 1
+    try:
+        available = os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        # Not on this platform (e.g. Windows): stay small rather than risk swapping
+        return min(cores, 2)
+    return max(1, min(cores, int(available // WORKER_MEMORY)))
+
+
+def score_corpus(input_path, output_path, workers=1, chunk_size=16, text_field="text", id_field="id",
+                 cache_path=None, cache_size=1_000_000, backend_name="torch", mode="sentence", onnx_dir=ONNX_DIR):
+    """Scores every document of input_path not yet present in output_path, appending verdicts as they finish."""
+    done = load_checkpoint(output_path)
+    pending = (
+        (doc_id, text) for doc_id, text in read_corpus(input_path, text_field, id_field)
+        if doc_id not in done
+    )
+    threads = max(1, (os.cpu_count() or 1) // max(workers, 1))
+    print(f"Resuming after {len(done)} scored documents" if done else "Starting a fresh run", file=sys.stderr)
+
+    scored = 0
+    with open(output_path, 'a', encoding='utf-8') as out:
+        if workers <= 1:
+            _init_worker(threads, cache_path, cache_size, backend_name, mode, onnx_dir)
+            results = map(_score_batch, _batches(pending, chunk_size))
+            pool = None
+        else:
+            if backend_name.startswith("onnx"):
+                # Export once here; otherwise every worker would race to write the same graph
+                prepare_onnx(MODEL_ID, backend_name, onnx_dir)
+            # spawn, not fork: torch's thread pools do not survive a fork
+            pool = get_context("spawn").Pool(workers, initializer=_init_worker,
+                                              initargs=(threads, cache_path, cache_size, backend_name, mode, onnx_dir))
+            results = pool.imap_unordered(_score_batch, _batches(pending, chunk_size))
+
+        try:
+            for records in results:
+                for record in records:
+                    out.write(json.dumps(record) + '\n')
+                # Flushing after every batch is what makes the output file a usable checkpoint
+                out.flush()
+                scored += len(records)
+                print(f"Scored {len(done) + scored} documents", file=sys.stderr)
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    return scored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a JSONL/CSV corpus with the AI slop detector.")
+    parser.add_argument("input", help="corpus file (.jsonl or .csv)")
+    parser.add_argument("output", help="verdicts file (.jsonl); also used as the resume checkpoint")
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="number of worker processes (default: cores, capped by available memory)")
+    parser.add_argument("--chunk-size", type=int, default=16, help="documents sent to a worker at a time")
+    parser.add_argument("--text-field", default="text", help="field/column holding the document text")
+    parser.add_argument("--id-field", default="id", help="field/column holding the document id")
+    parser.add_argument("--cache", help="SQLite file for the sentence perplexity cache (shared by all workers)")
+    parser.add_argument("--cache-size", type=int, default=1_000_000, help="max cached sentences before LRU eviction")
+    parser.add_argument("--mode", choices=("sentence", "window"), default="sentence",
+                        help="score sentences in isolation, or whole documents with a sliding window")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch", help="GPT-2 scoring backend")
+    parser.add_argument("--onnx-dir", default=ONNX_DIR, help="directory for the exported ONNX graphs")
+    parser.add_argument("--check-accuracy", type=int, default=0, metavar="N",
+                        help="before scoring, compare --backend against fp32 on the first N documents and stop if it drifts")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="max relative perplexity error for --check-accuracy")
+    args = parser.parse_args(argv)
+
+    if args.check_accuracy:
+        load_text_tools()
+        documents = read_corpus(args.input, args.text_field, args.id_field)
+        sentences = [
+            sentence for _, (_, text) in zip(range(args.check_accuracy), documents)
+            for sentence in sent_tokenize(text) if len(sentence.strip()) >= 10
+        ]
+        report = check_backend_accuracy(sentences, args.backend, tolerance=args.tolerance, onnx_dir=args.onnx_dir)
+        print(json.dumps(report, indent=2), file=sys.stderr)
+        if not report["passed"]:
+            sys.exit(f"Backend {args.backend} exceeds the {args.tolerance:.0%} perplexity tolerance")
+
+    scored = score_corpus(args.input, args.output, workers=args.workers, chunk_size=args.chunk_size,
+                          text_field=args.text_field, id_field=args.id_field,
+                          cache_path=args.cache, cache_size=args.cache_size, backend_name=args.backend, mode=args.mode,
+                          onnx_dir=args.onnx_dir)
+    print(f"Done: {scored} new verdicts written to {args.output}", file=sys.stderr)
+
+    if args.cache:
+        cache = PerplexityCache(args.cache, model_id=f"{MODEL_ID}:{args.backend}", max_entries=args.cache_size)
+        stats = cache.stats()
+        cache.close()
+        print(f"Perplexity cache: {stats['entries']} entries, {stats['hits']} hits, "
+              f"{stats['misses']} misses ({stats['hit_rate']:.1%} hit rate)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
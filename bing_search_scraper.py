@@ -1,26 +1,152 @@
-import requests
-from bs4 import BeautifulSoup
-
-def scrape_bing(query):
-    url = f"https://www.bing.com/search?q={query}"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    response = requests.get(url, headers=headers)
-    
+import asyncio
+import random
+from urllib.parse import urlencode, urlsplit
+
+import httpx # pooled HTTP/2 client for the async batch API
+
+from html_parsers import BACKENDS, bing_results
+from http_session import fetch
+
+BING_URL = "https://www.bing.com/search"
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+RESULTS_PER_PAGE = 10
+RETRY_STATUSES = {429, 500, 502, 503, 504} # worth retrying, everything else is final
+
+
+def search_url(query, page=0, base_url=BING_URL):
+    # urlencode escapes spaces, "&", "#" etc. so the query reaches Bing intact
+    params = {"q": query}
+    if page:
+        params["first"] = page * RESULTS_PER_PAGE + 1 # Bing's offset of the first result on the page
+    return f"{base_url}?{urlencode(params)}"
+
+
+def parse_results(html, parser="html.parser"):
+    # (title, link) per result; `parser` is any html_parsers.BACKENDS entry, e.g. "lxml" or "selectolax"
+    return bing_results(html, parser)
+
+
+def scrape_bing(query, parser="html.parser"):
+    # Shared keep-alive session with timeouts and retries (see http_session.py)
+    response = fetch(search_url(query), headers=HEADERS)
+
     if response.status_code != 200:
         print("Failed to retrieve search results") # handling errors
         return []
 
-    soup = BeautifulSoup(response.text, "html.parser") # parsing the info
-    results = [] # empty list to store data
+    return parse_results(response.text, parser)
+
+
+async def fetch_page(client, url, host_limit, retries=3, backoff=0.5):
+    """GETs `url`, retrying timeouts, connection errors and 429/5xx with exponential backoff.
+    Returns the page HTML, or None if it could not be retrieved."""
+    for attempt in range(retries + 1):
+        try:
+            async with host_limit(url):
+                response = await client.get(url)
+            if response.status_code == 200:
+                return response.text
+            if response.status_code not in RETRY_STATUSES:
+                break
+            delay = backoff * 2 ** attempt
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit(): # honour the server's Retry-After when given in seconds
+                delay = max(delay, int(retry_after))
+        except httpx.TransportError as error: # timeouts, refused/reset connections
+            response = error
+            delay = backoff * 2 ** attempt
+        if attempt < retries:
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5)) # jitter, so retries don't arrive in lockstep
+
+    print(f"Failed to retrieve {url}: {getattr(response, 'status_code', response)}")
+    return None
+
+
+async def scrape_bing_many(queries, pages=1, concurrency=20, per_host=8, retries=3, backoff=0.5,
+                           timeout=10.0, base_url=BING_URL, parser="html.parser"):
+    """Async generator over the results of many queries, yielding (query, title, link) as pages arrive.
+
+    `concurrency` queries are worked on at once over one pooled HTTP/2 client, with at most
+    `per_host` requests in flight to any single host. Each query walks up to `pages` result
+    pages and stops early at a page that brings no new links.
+    `base_url` can point at a local fixture server instead of Bing, and `parser` picks the
+    html_parsers backend.
+    """
+    host_limits = {}
+
+    def host_limit(url):
+        host = urlsplit(url).netloc
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(per_host)
+        return host_limits[host]
+
+    todo = iter(queries)
+    records = asyncio.Queue(maxsize=concurrency * RESULTS_PER_PAGE) # backpressure for slow consumers
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    # http2=True needs the h2 extra: pip install "httpx[http2]"
+    async with httpx.AsyncClient(http2=True, headers=HEADERS, timeout=timeout, limits=limits,
+                                 follow_redirects=True) as client:
+
+        async def worker():
+            try:
+                # All workers share one iterator; next() never awaits, so no query is handed out twice
+                for query in todo:
+                    seen = set() # Bing repeats results past the last page
+                    for page in range(pages):
+                        html = await fetch_page(client, search_url(query, page, base_url), host_limit, retries, backoff)
+                        if html is None:
+                            break
+                        new = [(title, link) for title, link in parse_results(html, parser) if link not in seen]
+                        if not new:
+                            break
+                        for title, link in new:
+                            seen.add(link)
+                            await records.put((query, title, link))
+            finally:
+                await records.put(None) # this worker is finished
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            running = len(workers)
+            while running:
+                record = await records.get()
+                if record is None:
+                    running -= 1
+                else:
+                    yield record
+            await asyncio.gather(*workers) # re-raises anything that went wrong inside a worker
+        finally:
+            for task in workers:
+                task.cancel()
+
+
+def scrape_bing_batch(queries, **kwargs):
+    """Blocking wrapper around `scrape_bing_many`, returning every (query, title, link) record."""
+    async def collect():
+        return [record async for record in scrape_bing_many(queries, **kwargs)]
+    return asyncio.run(collect())
+
+
+if __name__ == "__main__":
+    import argparse
 
-    for item in soup.find_all("li", class_="b_algo"):
-        title = item.find("h2") # extracting the result title
-        link = title.find("a")["href"] if title else "" # extracting the link
-        results.append((title.text if title else "No title", link))
-        # if title is not found, just returns the link with "No title" placeholder
-    return results
-  
+    cli = argparse.ArgumentParser(description="Scrape Bing search results for one or more queries.")
+    cli.add_argument("queries", nargs="*", default=["apify"]) # replace your seach query
+    cli.add_argument("--pages", type=int, default=1, help="result pages per query")
+    cli.add_argument("--concurrency", type=int, default=20, help="queries fetched at once")
+    cli.add_argument("--per-host", type=int, default=8, help="max requests in flight per host")
+    cli.add_argument("--base-url", default=BING_URL, help="e.g. a local fixture server")
+    cli.add_argument("--parser", default="html.parser", choices=BACKENDS)
+    args = cli.parse_args()
 
-search_results = scrape_bing("apify") # replace your seach query
-for title, link in search_results:
-    print(f"{title}: {link}")
+    if len(args.queries) == 1 and args.pages == 1 and args.base_url == BING_URL:
+        for title, link in scrape_bing(args.queries[0], args.parser):
+            print(f"{title}: {link}")
+    else:
+        async def run():
+            async for query, title, link in scrape_bing_many(args.queries, args.pages, args.concurrency,
+                                                             args.per_host, base_url=args.base_url,
+                                                             parser=args.parser):
+                print(f"[{query}] {title}: {link}")
+        asyncio.run(run())
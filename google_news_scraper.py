@@ -1,59 +1,153 @@
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
-from bs4 import BeautifulSoup
 
-def get_google_news():
-    url = "https://news.google.com/topics/CAAqJggKIiBDQkFTRWdvSUwyMHZNRGx1YlY4U0FtVnVHZ0pWVXlnQVAB?ceid=US:en&oc=3"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
+from html_parsers import GOOGLE_NEWS_URL, google_news_items
+from http_session import fetch
 
-    news_items = []
+DEFAULT_TOPIC = "CAAqJggKIiBDQkFTRWdvSUwyMHZNRGx1YlY4U0FtVnVHZ0pWVXlnQVAB"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
 
-    # Finding all story containers
-    containers = soup.find_all('div', class_='W8yrY')
+def topic_url(topic, base_url=GOOGLE_NEWS_URL):
+    return f"{base_url}/topics/{topic}?ceid=US:en&oc=3"
 
-    # Scraping at least 10 headlines
-    for container in containers:
-        try:
-            # Getting the primary article in each container
-            article = container.find('article')
-            if not article:
-                continue
+def get_google_news(parser="html.parser"):
+    # `parser` is any html_parsers.BACKENDS entry; "lxml" and "selectolax" parse several times faster
+    url = topic_url(DEFAULT_TOPIC)
+    # Shared keep-alive session with timeouts and retries (see http_session.py)
+    response = fetch(url, headers=HEADERS)
 
-            # Extracting headline
-            headline_elem = article.find('a', class_='gPFEn')
-            headline = headline_elem.get_text(strip=True) if headline_elem else 'No headline'
+    # Source, headline and link of the primary article in every story container
+    news_items = google_news_items(response.text, parser)
 
-            # Extracting source
-            source_elem = article.find('div', class_='vr1PYe')
-            source = source_elem.get_text(strip=True) if source_elem else 'Unknown source'
+    # Stop at 10 items
+    return news_items[:10]
 
-            # Extracting and converting the URLs
-            relative_link = headline_elem['href'] if headline_elem else ''
-            absolute_link = f'<https://news.google.com>{relative_link.split("?")[0]}' if relative_link else ''
 
-            news_items.append({
-                'source': source,
-                'headline': headline,
-                'link': absolute_link
-            })
+class SeenNews:
+    """
+    What previous polls already saw, kept in SQLite so it survives restarts:
+    every topic's ETag/Last-Modified validators and every headline link emitted so far.
+    """
 
-            # Stop if you have 10 items
-            if len(news_items) >= 10:
-                break
+    def __init__(self, path="google_news_seen.sqlite", max_age_days=30):
+        self.max_age = max_age_days * 86400
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS validators "
+            "(topic TEXT PRIMARY KEY, etag TEXT, last_modified TEXT)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS seen (link TEXT PRIMARY KEY, first_seen REAL NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS seen_first_seen ON seen (first_seen)")
+        self.conn.commit()
+
+    def conditional_headers(self, topic):
+        """If-None-Match/If-Modified-Since for `topic`, so an unchanged page comes back as an empty 304."""
+        row = self.conn.execute("SELECT etag, last_modified FROM validators WHERE topic = ?", (topic,)).fetchone()
+        headers = {}
+        if row and row[0]:
+            headers['If-None-Match'] = row[0]
+        if row and row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
 
-        except Exception as e:
-            print(f"Error processing article: {str(e)}")
-            continue
+    def save_validators(self, topic, response):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO validators (topic, etag, last_modified) VALUES (?, ?, ?)",
+                (topic, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            )
+
+    def keep_new(self, items):
+        """
+        Returns the items whose link was never seen before (first occurrence only) and records them.
+        Stories without a link can't be told apart, so they are always returned and never recorded.
+        """
+        links = list({item['link']: None for item in items if item['link']})
+        known = set()
+        # SQLite caps the number of bound parameters per statement
+        for start in range(0, len(links), 500):
+            chunk = links[start:start + 500]
+            known.update(row[0] for row in self.conn.execute(
+                f"SELECT link FROM seen WHERE link IN ({','.join('?' * len(chunk))})", chunk
+            ))
+
+        new = []
+        for item in items:
+            if not item['link']:
+                new.append(item)
+            elif item['link'] not in known:
+                known.add(item['link'])
+                new.append(item)
+
+        now = time.time()
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO seen (link, first_seen) VALUES (?, ?)",
+                                  [(item['link'], now) for item in new if item['link']])
+            # Forget links old enough that Google News no longer lists them, so the index stays small
+            self.conn.execute("DELETE FROM seen WHERE first_seen < ?", (now - self.max_age,))
+        return new
+
+
+def collect_google_news(topics, seen, workers=8, timeout=10, parser="html.parser", base_url=GOOGLE_NEWS_URL):
+    """
+    Fetches every topic page in `topics` concurrently and returns only the stories not emitted
+    by an earlier poll, each tagged with its 'topic'.
+    Requests carry the validators of the previous fetch, so unchanged pages cost a 304 with
+    no body, and every story on a changed page is kept (no 10-item limit).
+    `base_url` can point at a local fixture server instead of Google News.
+    Pages go through the shared http_session pool; keep `workers` within its pool size.
+    """
+    def fetch_topic(topic, headers):
+        try:
+            return fetch(topic_url(topic, base_url), headers={**HEADERS, **headers}, timeout=timeout)
+        except requests.RequestException as e:
+            print(f"Failed to fetch topic {topic}: {e}")
+            return None
+
+    # SQLite stays on this thread; the pool only does network I/O
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        responses = pool.map(fetch_topic, topics, [seen.conditional_headers(topic) for topic in topics])
+
+        new_items = []
+        for topic, response in zip(topics, responses):
+            if response is None or response.status_code == 304:
+                continue
+            if response.status_code != 200:
+                print(f"Failed to fetch topic {topic}: HTTP {response.status_code}")
+                continue
+            items = [dict(item, topic=topic) for item in google_news_items(response.text, parser)]
+            new_items.extend(seen.keep_new(items))
+            seen.save_validators(topic, response)
+    return new_items
 
-    return news_items
 
 # Running and printing the results
 if __name__ == "__main__":
-    news = get_google_news()
-    for idx, item in enumerate(news, 1):
-        print(f"{idx}. {item['source']}: {item['headline']}")
-        print(f"   Link: {item['link']}\\n")
+    import argparse
 
+    cli = argparse.ArgumentParser(description="Print Google News headlines; with topic ids, only new ones.")
+    cli.add_argument("topics", nargs="*", help="topic ids to poll (default: print the top 10 stories once)")
+    cli.add_argument("--db", default="google_news_seen.sqlite", help="seen-link index and page validators")
+    cli.add_argument("--every", type=float, default=0, help="poll again every N seconds")
+    cli.add_argument("--workers", type=int, default=8)
+    args = cli.parse_args()
+
+    if not args.topics:
+        news = get_google_news()
+        for idx, item in enumerate(news, 1):
+            print(f"{idx}. {item['source']}: {item['headline']}")
+            print(f"   Link: {item['link']}\n")
+    else:
+        seen = SeenNews(args.db)
+        while True:
+            for item in collect_google_news(args.topics, seen, args.workers):
+                print(f"[{item['topic'][:12]}] {item['source']}: {item['headline']}")
+                print(f"   Link: {item['link']}\n")
+            if not args.every:
+                break
+            time.sleep(args.every)
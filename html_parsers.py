@@ -0,0 +1,248 @@
+"""
+HTML extraction for the Bing, Google News and IMDb scrapers, with a switchable parser backend.
+
+Every page type has one extractor per backend, and all backends return identical records:
+  html.parser - BeautifulSoup with Python's built-in parser (what the scrapers used originally)
+  bs4-lxml    - BeautifulSoup on top of lxml's tree builder
+  lxml        - raw lxml.html with precompiled XPath expressions
+  selectolax  - selectolax's C (Lexbor) parser with CSS selectors
+The raw lxml and selectolax backends skip BeautifulSoup's Python object tree entirely, which is
+where most of the parse time and memory goes on large result pages.
+
+Run `python html_parsers.py <saved pages...>` to benchmark the backends over saved HTML fixtures
+(the page type comes from the file name: bing*.html, news*.html or imdb*.html).
+"""
+import re
+from functools import lru_cache
+from urllib.parse import urljoin
+
+BACKENDS = ("html.parser", "bs4-lxml", "lxml", "selectolax")
+GOOGLE_NEWS_URL = "https://news.google.com"
+
+# IMDb title links, e.g. /title/tt0111161/
+IMDB_TITLE_HREF = re.compile(r'\/title\/tt+\d*\/')
+
+# CSS-class tests for XPath 1.0, which has no class selector
+_HAS_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+
+
+@lru_cache(maxsize=None)
+def _xpath(expression):
+    """Compiles an XPath expression once and reuses it on every page."""
+    from lxml import etree
+    return etree.XPath(expression, namespaces={"re": "http://exslt.org/regular-expressions"})
+
+
+def _soup(html, backend):
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, "lxml" if backend == "bs4-lxml" else "html.parser")
+
+
+def _lxml_root(html):
+    import lxml.html
+    return lxml.html.document_fromstring(html)
+
+
+def _selectolax_tree(html):
+    from selectolax.lexbor import LexborHTMLParser
+    return LexborHTMLParser(html)
+
+
+def _stripped_text(pieces):
+    # BeautifulSoup's get_text(strip=True): every text node stripped, then joined without a separator
+    return "".join(piece.strip() for piece in pieces)
+
+
+# --- Bing: (title, link) per organic result ---
+
+def _bing_bs4(html, backend):
+    results = []
+    for item in _soup(html, backend).find_all("li", class_="b_algo"):
+        title = item.find("h2") # extracting the result title
+        anchor = title.find("a") if title else None
+        link = anchor.get("href", "") if anchor else "" # extracting the link
+        results.append((title.text if title else "No title", link))
+    return results
+
+
+def _bing_lxml(html, backend):
+    results = []
+    for item in _xpath(f"//li[{_HAS_CLASS.format('b_algo')}]")(_lxml_root(html)):
+        title = _xpath("(.//h2)[1]")(item)
+        anchor = _xpath("(.//a)[1]")(title[0]) if title else []
+        link = anchor[0].get("href", "") if anchor else ""
+        results.append((title[0].text_content() if title else "No title", link))
+    return results
+
+
+def _bing_selectolax(html, backend):
+    results = []
+    for item in _selectolax_tree(html).css("li.b_algo"):
+        title = item.css_first("h2")
+        anchor = title.css_first("a") if title else None
+        link = (anchor.attributes.get("href") or "") if anchor else ""
+        results.append((title.text(deep=True) if title else "No title", link))
+    return results
+
+
+# --- Google News: {'source', 'headline', 'link'} per story container ---
+
+def _news_record(source, headline, relative_link):
+    return {
+        'source': source or 'Unknown source',
+        'headline': headline or 'No headline',
+        # Extracting and converting the URLs: hrefs look like "./read/CBMi...?hl=en-US", so they are
+        # resolved against the site root instead of being glued onto it
+        'link': urljoin(GOOGLE_NEWS_URL + '/', relative_link.split("?")[0]) if relative_link else ''
+    }
+
+
+def _news_bs4(html, backend):
+    news_items = []
+    for container in _soup(html, backend).find_all('div', class_='W8yrY'):
+        article = container.find('article') # the primary article in each container
+        if not article:
+            continue
+        headline_elem = article.find('a', class_='gPFEn')
+        source_elem = article.find('div', class_='vr1PYe')
+        news_items.append(_news_record(
+            source_elem.get_text(strip=True) if source_elem else '',
+            headline_elem.get_text(strip=True) if headline_elem else '',
+            headline_elem.get('href', '') if headline_elem else ''
+        ))
+    return news_items
+
+
+def _news_lxml(html, backend):
+    news_items = []
+    for container in _xpath(f"//div[{_HAS_CLASS.format('W8yrY')}]")(_lxml_root(html)):
+        article = _xpath("(.//article)[1]")(container)
+        if not article:
+            continue
+        headline_elem = _xpath(f"(.//a[{_HAS_CLASS.format('gPFEn')}])[1]")(article[0])
+        source_elem = _xpath(f"(.//div[{_HAS_CLASS.format('vr1PYe')}])[1]")(article[0])
+        news_items.append(_news_record(
+            _stripped_text(source_elem[0].itertext()) if source_elem else '',
+            _stripped_text(headline_elem[0].itertext()) if headline_elem else '',
+            headline_elem[0].get('href', '') if headline_elem else ''
+        ))
+    return news_items
+
+
+def _news_selectolax(html, backend):
+    news_items = []
+    for container in _selectolax_tree(html).css('div.W8yrY'):
+        article = container.css_first('article')
+        if not article:
+            continue
+        headline_elem = article.css_first('a.gPFEn')
+        source_elem = article.css_first('div.vr1PYe')
+        news_items.append(_news_record(
+            source_elem.text(deep=True, separator='', strip=True) if source_elem else '',
+            headline_elem.text(deep=True, separator='', strip=True) if headline_elem else '',
+            (headline_elem.attributes.get('href') or '') if headline_elem else ''
+        ))
+    return news_items
+
+
+# --- IMDb: the text of every title link that holds only text (poster links hold an <img>) ---
+
+def _imdb_bs4(html, backend):
+    anchors = _soup(html, backend).find_all("a", attrs={"href": IMDB_TITLE_HREF})
+    return [a.get_text() for a in anchors if a.find(True) is None and a.get_text()]
+
+
+def _imdb_lxml(html, backend):
+    anchors = _xpath(f"//a[re:test(@href, '{IMDB_TITLE_HREF.pattern}')]")(_lxml_root(html))
+    return [a.text for a in anchors if len(a) == 0 and a.text]
+
+
+def _imdb_selectolax(html, backend):
+    anchors = _selectolax_tree(html).css('a[href*="/title/tt"]')
+    return [
+        a.text(deep=True) for a in anchors
+        if IMDB_TITLE_HREF.search(a.attributes.get("href") or "")
+        and next(a.iter(), None) is None and a.text(deep=True)
+    ]
+
+
+EXTRACTORS = {
+    "bing": {"html.parser": _bing_bs4, "bs4-lxml": _bing_bs4, "lxml": _bing_lxml, "selectolax": _bing_selectolax},
+    "news": {"html.parser": _news_bs4, "bs4-lxml": _news_bs4, "lxml": _news_lxml, "selectolax": _news_selectolax},
+    "imdb": {"html.parser": _imdb_bs4, "bs4-lxml": _imdb_bs4, "lxml": _imdb_lxml, "selectolax": _imdb_selectolax},
+}
+
+
+def extract(kind, html, backend="html.parser"):
+    """Extracts the records of a `kind` ('bing', 'news' or 'imdb') page with the given parser backend."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+    return EXTRACTORS[kind][backend](html, backend)
+
+
+def bing_results(html, backend="html.parser"):
+    return extract("bing", html, backend)
+
+
+def google_news_items(html, backend="html.parser"):
+    return extract("news", html, backend)
+
+
+def imdb_titles(html, backend="bs4-lxml"):
+    return extract("imdb", html, backend)
+
+
+def _fixture_kind(path):
+    name = path.replace("\\", "/").rsplit("/", 1)[-1].lower()
+    for kind in EXTRACTORS:
+        if name.startswith(kind):
+            return kind
+    raise ValueError(f"Can't tell the page type of {path}; name it bing*.html, news*.html or imdb*.html")
+
+
+def _time_backend(pages, backend, repeats):
+    # Runs in a fresh process, so the peak RSS growth belongs to this backend alone
+    import resource
+    import time
+
+    extract(pages[0][0], pages[0][1], backend) # imports the parser before the baseline is taken
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        records = [extract(kind, html, backend) for kind, html in pages]
+        best = min(best, time.perf_counter() - start)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    return best / len(pages), peak_kb, records
+
+
+def benchmark_parsers(paths, backends=BACKENDS, repeats=5):
+    """Checks every backend extracts the same records as html.parser from the saved pages in
+    `paths`, then prints each backend's parse time per page and peak memory growth."""
+    import multiprocessing
+
+    pages = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append((_fixture_kind(path), f.read()))
+    size_kb = sum(len(html) for _, html in pages) / len(pages) / 1024
+
+    reference = [extract(kind, html) for kind, html in pages]
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for backend in backends:
+            per_page, peak_kb, records = pool.apply(_time_backend, (pages, backend, repeats))
+            status = "identical" if records == reference else "MISMATCH"
+            print(f"{backend:<11}: {per_page * 1000:8.2f} ms/page ({size_kb:,.0f} KB pages), "
+                  f"peak RSS +{peak_kb / 1024:,.1f} MB, records {status}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the HTML parser backends on saved pages.")
+    parser.add_argument("fixtures", nargs="+", help="saved bing*/news*/imdb*.html pages")
+    parser.add_argument("--backends", nargs="+", default=BACKENDS, choices=BACKENDS)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    benchmark_parsers(args.fixtures, args.backends, args.repeats)
@@ -0,0 +1,225 @@
+"""
+On-disk HTTP response cache behind the scrapers' shared session (see http_session.py).
+
+Modes, set with http_session.configure(cache_mode=...) or the HTTP_CACHE_MODE environment variable:
+  off     - no caching (the default)
+  on      - a private HTTP cache: honours Cache-Control (no-store, no-cache, max-age) and Expires,
+            revalidates stale entries with their ETag/Last-Modified, and keeps responses that
+            carry no freshness information for `ttl` seconds
+  record  - like "on", but also stores responses marked no-store/no-cache, for building replay sets
+  offline - replay: answers every GET from the cache, whatever its age, and never touches the
+            network; a miss raises CacheMiss
+Entries are keyed by method + URL + the request headers named in the response's Vary, and live
+in one SQLite file; the least recently used ones are evicted past `max_bytes` of bodies.
+
+`python http_cache.py stats` summarises a cache, `python http_cache.py replay` re-runs the
+html_parsers extraction over every cached Bing/Google News/IMDb page without any network access.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+
+CACHE_MODES = ("off", "on", "record", "offline")
+CACHE_PATH = os.path.join(".http_cache", "responses.sqlite")
+DEFAULT_TTL = 24 * 3600  # for responses without Cache-Control/Expires
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+CACHEABLE_STATUSES = {200, 203, 301, 404, 410}
+# Describe the stored (already decoded) body no longer, so they are dropped before storing
+_HOP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+class CacheMiss(requests.ConnectionError):
+    """Raised in offline mode for a request that has no cached response."""
+
+
+def cache_control(headers):
+    """Parses a Cache-Control header into {directive: value or True}."""
+    directives = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') if value else True
+    return directives
+
+
+def freshness_lifetime(headers, default_ttl=DEFAULT_TTL):
+    """Seconds a response stays fresh: max-age, else Expires - Date, else `default_ttl`."""
+    directives = cache_control(headers)
+    if "no-cache" in directives:
+        return 0
+    if str(directives.get("max-age", "")).isdigit():
+        return int(directives["max-age"])
+    if "Expires" in headers:
+        try:
+            expires = parsedate_to_datetime(headers["Expires"]).timestamp()
+            date = parsedate_to_datetime(headers["Date"]).timestamp() if "Date" in headers else time.time()
+            return max(expires - date, 0)
+        except (TypeError, ValueError):
+            return 0  # an invalid Expires (often "0" or "-1") means already expired
+    return default_ttl
+
+
+class HTTPCache:
+    """Response store: SQLite rows of (status, headers, body, expiry), plus each URL's Vary header names."""
+
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection shared by the scrapers' worker threads, serialised by the lock
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT NOT NULL, "
+            "status INTEGER NOT NULL, reason TEXT, headers TEXT NOT NULL, body BLOB NOT NULL, "
+            "size INTEGER NOT NULL, stored REAL NOT NULL, expires REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS vary (method_url TEXT PRIMARY KEY, names TEXT NOT NULL)")
+        self.conn.commit()
+
+    def key(self, request, names=None):
+        """sha256 of method, URL and the values of the Vary'd request headers."""
+        method_url = f"{request.method} {request.url}"
+        if names is None:
+            row = self.conn.execute("SELECT names FROM vary WHERE method_url = ?", (method_url,)).fetchone()
+            names = json.loads(row[0]) if row else []
+        varied = [(name, request.headers.get(name, "")) for name in names]
+        return hashlib.sha256(json.dumps([method_url, varied]).encode("utf-8")).hexdigest()
+
+    def get(self, request):
+        """The cached entry for `request` as a dict (with 'fresh' set), or None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT key, url, status, reason, headers, body, expires FROM responses WHERE key = ?",
+                (self.key(request),)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            with self.conn:
+                self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, row[0]))
+        key, url, status, reason, headers, body, expires = row
+        return {"key": key, "url": url, "status": status, "reason": reason,
+                "headers": json.loads(headers), "body": body, "fresh": expires > now}
+
+    def put(self, request, response, force=False):
+        """Stores `response` if it is cacheable; `force` ignores no-store and private."""
+        directives = cache_control(response.headers)
+        vary = [name.strip().lower() for name in response.headers.get("Vary", "").split(",") if name.strip()]
+        if response.status_code not in CACHEABLE_STATUSES or "*" in vary:
+            return False
+        if not force and ("no-store" in directives or "no-store" in cache_control(request.headers)):
+            return False
+
+        names = sorted(set(vary))
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in _HOP_HEADERS}
+        body = response.content
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO vary (method_url, names) VALUES (?, ?)",
+                              (f"{request.method} {request.url}", json.dumps(names)))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, status, reason, headers, body, size, stored, expires, "
+                "last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.key(request, names), response.url or request.url, response.status_code, response.reason,
+                 json.dumps(headers), body, len(body), now,
+                 now + freshness_lifetime(response.headers, self.ttl), now)
+            )
+            self._evict()
+        return True
+
+    def refresh(self, entry, response):
+        """Extends a stale entry after a 304 Not Modified, taking over the response's new headers."""
+        headers = dict(entry["headers"])
+        headers.update((name, value) for name, value in response.headers.items() if name.lower() not in _HOP_HEADERS)
+        entry["headers"] = headers
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE responses SET headers = ?, expires = ? WHERE key = ?",
+                              (json.dumps(headers), time.time() + freshness_lifetime(headers, self.ttl), entry["key"]))
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Least recently used first, until the bodies fit again
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def to_response(self, entry, request):
+        """Rebuilds a `requests.Response` from a cached entry."""
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.headers = requests.structures.CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"]
+        response.url = entry["url"]
+        response.request = request
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+    def entries(self, host=None):
+        """Yields (url, status, body) of every cached response, optionally only those for `host`."""
+        with self.lock:
+            rows = self.conn.execute("SELECT url, status, body FROM responses ORDER BY stored").fetchall()
+        for url, status, body in rows:
+            if host is None or urlsplit(url).netloc == host:
+                yield url, status, body
+
+    def stats(self):
+        with self.lock:
+            count, size, fresh = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(expires > ?), 0) FROM responses", (time.time(),)
+            ).fetchone()
+        return {"entries": count, "bytes": size, "fresh": fresh}
+
+
+# Hosts whose cached pages `replay` knows how to extract, and with which html_parsers extractor
+REPLAY_KINDS = {"www.bing.com": "bing", "news.google.com": "news", "www.imdb.com": "imdb"}
+
+
+def replay(cache, backend="html.parser"):
+    """Runs the html_parsers extraction over every cached Bing/Google News/IMDb page, offline.
+    Returns {url: records}."""
+    from html_parsers import extract
+
+    results = {}
+    for url, status, body in cache.entries():
+        kind = REPLAY_KINDS.get(urlsplit(url).netloc)
+        if kind and status == 200:
+            results[url] = extract(kind, body.decode("utf-8", errors="replace"), backend)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    cli = argparse.ArgumentParser(description="Inspect the scrapers' HTTP response cache or replay it offline.")
+    cli.add_argument("command", choices=["stats", "replay"])
+    cli.add_argument("--path", default=os.environ.get("HTTP_CACHE_PATH", CACHE_PATH))
+    cli.add_argument("--parser", default="html.parser", help="html_parsers backend used by replay")
+    args = cli.parse_args()
+
+    cache = HTTPCache(args.path)
+    if args.command == "stats":
+        summary = cache.stats()
+        print(f"{summary['entries']} responses ({summary['fresh']} fresh), {summary['bytes'] / 1e6:,.1f} MB")
+    else:
+        start = time.perf_counter()
+        results = replay(cache, args.parser)
+        elapsed = time.perf_counter() - start
+        records = sum(len(page) for page in results.values())
+        print(f"Re-extracted {records:,} records from {len(results):,} cached pages in {elapsed:.2f}s")
@@ -0,0 +1,217 @@
+"""
+Shared HTTP fetch layer for the requests-based scrapers (Bing, Google News, IMDb).
+
+A module-level `requests.Session` keeps TCP+TLS connections alive in a bounded pool per host,
+so repeated requests skip the handshake. Every request gets a default timeout, and idempotent
+requests are retried with exponential backoff on connection errors and 429/5xx responses
+(Retry-After is honoured). Per-host latency and connection reuse are recorded and available
+from `stats()` / `print_stats()`.
+GETs can also go through the on-disk response cache in http_cache.py (`cache_mode`, or the
+HTTP_CACHE_MODE / HTTP_CACHE_PATH environment variables), e.g. HTTP_CACHE_MODE=offline to
+re-run a scraper against previously cached pages without network access.
+"""
+import os
+import threading
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from http_cache import CACHE_MODES, CACHE_PATH, DEFAULT_MAX_BYTES, DEFAULT_TTL, CacheMiss, HTTPCache, cache_control
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+POOL_SIZE = 16  # connections kept alive per host
+POOL_HOSTS = 32  # hosts whose pools are kept at once
+TIMEOUT = (5, 20)  # (connect, read) seconds
+RETRIES = 3
+BACKOFF = 0.5  # sleeps 0.5s, 1s, 2s, ... between retries
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+LATENCY_SAMPLES = 1000  # recent latencies kept per host for the percentiles
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout, since requests has none (it waits forever)."""
+
+    def __init__(self, timeout=TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+
+class CachingHTTPAdapter(TimeoutHTTPAdapter):
+    """TimeoutHTTPAdapter that answers GETs from an HTTPCache where it can (see http_cache.py)."""
+
+    def __init__(self, cache=None, cache_mode="off", **kwargs):
+        self.cache = cache
+        self.cache_mode = cache_mode
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, **kwargs):
+        if self.cache is None or request.method != "GET" or stream:
+            return super().send(request, stream=stream, **kwargs)
+
+        entry = self.cache.get(request)
+        if self.cache_mode == "offline":
+            if entry is None:
+                raise CacheMiss(f"{request.url} is not cached (HTTP cache is in offline mode)", request=request)
+            return self.cache.to_response(entry, request)
+
+        # Requests that carry their own validators (e.g. the Google News collector's) or ask for
+        # no-cache are left to the server; the response still refreshes the cache
+        conditional = "If-None-Match" in request.headers or "If-Modified-Since" in request.headers
+        bypass = conditional or {"no-cache", "no-store"} & set(cache_control(request.headers))
+        if entry is not None and not bypass:
+            if entry["fresh"]:
+                return self.cache.to_response(entry, request)
+            # Stale: revalidate with the stored validators, a 304 costs no body
+            validators = {"If-None-Match": entry["headers"].get("ETag"),
+                          "If-Modified-Since": entry["headers"].get("Last-Modified")}
+            if any(validators.values()):
+                request = request.copy()
+                request.headers.update({name: value for name, value in validators.items() if value})
+
+        response = super().send(request, stream=stream, **kwargs)
+        if response.status_code == 304 and entry is not None and not conditional:
+            self.cache.refresh(entry, response)
+            return self.cache.to_response(entry, request)
+        self.cache.put(request, response, force=self.cache_mode == "record")
+        return response
+
+
+class HostStats:
+    """Request count, errors, latency samples and new connections opened, for one host."""
+
+    def __init__(self):
+        self.requests = 0
+        self.responses = 0  # requests that got an HTTP response (the rest failed on the network)
+        self.cache_hits = 0
+        self.errors = 0
+        self.connections = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.pool = None  # (id, num_connections) of the urllib3 pool seen last
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+
+        def percentile(q):
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else None
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "new_connections": self.connections,
+            # Requests served over an already open keep-alive connection
+            "reused": max(self.responses - self.cache_hits - self.connections, 0),
+            "cache_hits": self.cache_hits,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else None,
+        }
+
+
+_lock = threading.Lock()
+_session = None
+_stats = defaultdict(HostStats)
+
+
+def _record(response, *args, **kwargs):
+    # Response hook: runs once per response (each redirect hop, and the final answer after retries)
+    host = urlsplit(response.url).netloc
+    # The urllib3 connection pool that served the response
+    pool = getattr(response.raw, "_pool", None)
+    with _lock:
+        stats = _stats[host]
+        stats.requests += 1
+        stats.responses += 1
+        stats.errors += response.status_code >= 400
+        stats.cache_hits += getattr(response, "from_cache", False)
+        stats.latencies.append(response.elapsed.total_seconds())
+        if pool is not None:
+            # num_connections counts the connections this pool ever opened; a host's pool may have
+            # been evicted and recreated since the last response, hence the identity check
+            previous_id, previous_count = stats.pool or (None, 0)
+            stats.connections += pool.num_connections - (previous_count if previous_id == id(pool) else 0)
+            stats.pool = (id(pool), pool.num_connections)
+
+
+def configure(pool_size=POOL_SIZE, timeout=TIMEOUT, retries=RETRIES, backoff=BACKOFF,
+              compression=True, headers=None, cache_mode=None, cache_path=None,
+              cache_ttl=DEFAULT_TTL, cache_max_bytes=DEFAULT_MAX_BYTES):
+    """(Re)builds the shared session. `compression=False` asks servers for uncompressed bodies;
+    `cache_mode` is one of http_cache.CACHE_MODES (default: $HTTP_CACHE_MODE, else "off")."""
+    global _session
+    cache_mode = cache_mode or os.environ.get("HTTP_CACHE_MODE", "off")
+    if cache_mode not in CACHE_MODES:
+        raise ValueError(f"Unknown cache mode {cache_mode!r}, expected one of {', '.join(CACHE_MODES)}")
+    cache = None
+    if cache_mode != "off":
+        cache = HTTPCache(cache_path or os.environ.get("HTTP_CACHE_PATH", CACHE_PATH), cache_ttl, cache_max_bytes)
+
+    retry = Retry(
+        total=retries, backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        respect_retry_after_header=True,
+        raise_on_status=False  # hand back the last 429/5xx instead of raising
+    )
+    adapter = CachingHTTPAdapter(cache=cache, cache_mode=cache_mode, timeout=timeout, max_retries=retry,
+                                 pool_connections=POOL_HOSTS, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    session.headers.update(headers or {})
+    # requests already negotiates gzip/deflate (and br/zstd when brotli/zstandard are installed)
+    if not compression:
+        session.headers["Accept-Encoding"] = "identity"
+    session.hooks["response"].append(_record)
+
+    with _lock:
+        previous = _session
+        _session = session
+    if previous is not None:
+        previous.close()
+    return session
+
+
+def get_session():
+    """The shared session, built with the default settings on first use."""
+    with _lock:
+        session = _session
+    return session if session is not None else configure()
+
+
+def fetch(url, method="GET", **kwargs):
+    """`requests.request` through the shared session; keyword arguments are passed through.
+    Requests that fail without a response (after the retries) are counted as errors too."""
+    try:
+        return get_session().request(method, url, **kwargs)
+    except requests.RequestException:
+        with _lock:
+            stats = _stats[urlsplit(url).netloc]
+            stats.requests += 1
+            stats.errors += 1
+        raise
+
+
+def stats():
+    """{host: summary} of every host fetched so far (see `HostStats.summary`)."""
+    with _lock:
+        return {host: host_stats.summary() for host, host_stats in _stats.items()}
+
+
+def reset_stats():
+    with _lock:
+        _stats.clear()
+
+
+def print_stats():
+    for host, summary in sorted(stats().items()):
+        latency = (f"p50 {summary['p50_ms']:.0f} ms, p95 {summary['p95_ms']:.0f} ms"
+                   if summary["p50_ms"] is not None else "no latency samples")
+        print(f"{host}: {summary['requests']} requests ({summary['cache_hits']} from cache), "
+              f"{summary['new_connections']} connections opened, {summary['reused']} reused, "
+              f"{summary['errors']} errors, {latency}")
@@ -0,0 +1,153 @@
+"""
+HTTP service around movie_recommendation_system: GET /recommendations/<emotion> returns the
+titles for the emotion's IMDb genre as JSON.
+
+Lookups are served from the in-memory GenreCache, so a request normally costs a dict lookup.
+Every genre is warmed at startup and refreshed in the background before it goes stale. When
+several requests need a genre that is not loaded yet, they all wait on a single upstream fetch
+(single-flight) instead of each hitting IMDb.
+GET /metrics reports request counts, p50/p99 latency and upstream fetch counts.
+
+Run:  python movie_recommendation_service.py --port 8080
+Pass --imdb-base-url (or set IMDB_BASE_URL) to serve from a local fixture server instead of IMDb.
+"""
+import asyncio
+import time
+from collections import deque
+
+from aiohttp import web
+
+import movie_recommendation_system as recommender
+
+LATENCY_SAMPLES = 10_000  # most recent request latencies kept for the percentiles
+DEFAULT_LIMIT = 12
+
+
+class Metrics:
+    """Request latencies and counters for /metrics."""
+
+    def __init__(self):
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.requests = 0
+        self.errors = 0
+        self.upstream_fetches = 0
+        self.coalesced = 0  # requests that joined another request's in-flight fetch
+
+    def percentile(self, q):
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else None
+
+    def summary(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "p50_ms": self.percentile(0.50),
+            "p99_ms": self.percentile(0.99),
+            "upstream_fetches": self.upstream_fetches,
+            "coalesced_requests": self.coalesced,
+        }
+
+
+class RecommendationService:
+    def __init__(self, cache=None):
+        self.cache = cache or recommender.recommendations
+        self.metrics = Metrics()
+        self.inflight = {}  # genre -> task fetching it for the first time
+
+    async def titles(self, genre):
+        if genre in self.cache.entries:
+            # Loaded: answered from memory; a stale list also schedules a background refresh
+            return self.cache.get(genre)
+
+        task = self.inflight.get(genre)
+        if task is None:
+            self.metrics.upstream_fetches += 1
+            task = asyncio.ensure_future(asyncio.to_thread(self.cache.refresh, genre))
+            self.inflight[genre] = task
+            task.add_done_callback(lambda _: self.inflight.pop(genre, None))
+        else:
+            self.metrics.coalesced += 1
+        # shield: one client disconnecting must not cancel the fetch the others are waiting on
+        return await asyncio.shield(task)
+
+    async def warm(self):
+        results = await asyncio.gather(*(self.titles(genre) for genre in recommender.GENRES),
+                                       return_exceptions=True)
+        for genre, result in zip(recommender.GENRES, results):
+            if isinstance(result, Exception):
+                # Not fatal: the genre is fetched again on its first request
+                print(f"Could not warm {genre}: {result}")
+
+    @web.middleware
+    async def timing(self, request, handler):
+        start = time.perf_counter()
+        try:
+            response = await handler(request)
+        except web.HTTPException as e:
+            self.metrics.errors += e.status >= 400
+            raise
+        finally:
+            if request.path != "/metrics":
+                self.metrics.requests += 1
+                self.metrics.latencies.append(time.perf_counter() - start)
+        return response
+
+    async def recommendations(self, request):
+        emotion = request.match_info.get("emotion") or request.query.get("emotion", "")
+        try:
+            genre = recommender.genre_for(emotion)
+            limit = int(request.query.get("limit", DEFAULT_LIMIT))
+            if limit < 1:
+                # titles[:0] or titles[:-n] would quietly answer with a short or empty list
+                raise ValueError(f"limit must be at least 1, got {limit}")
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=str(e))
+
+        try:
+            titles = await self.titles(genre)
+        except Exception as e:
+            raise web.HTTPBadGateway(text=f"Could not fetch {genre} titles from IMDb: {e}")
+        return web.json_response({"emotion": emotion, "genre": genre, "titles": list(titles[:limit])})
+
+    async def metrics_handler(self, request):
+        now = time.monotonic()
+        summary = self.metrics.summary()
+        summary["genres"] = {genre: {"titles": len(titles), "age_s": round(now - fetched_at, 1)}
+                             for genre, (titles, fetched_at) in list(self.cache.entries.items())}
+        return web.json_response(summary)
+
+    async def on_startup(self, app):
+        await self.warm()
+        self.cache.start()
+
+    async def on_cleanup(self, app):
+        self.cache.stop()
+
+    def app(self):
+        app = web.Application(middlewares=[self.timing])
+        app.add_routes([
+            web.get("/recommendations", self.recommendations),
+            web.get("/recommendations/{emotion}", self.recommendations),
+            web.get("/metrics", self.metrics_handler),
+        ])
+        app.on_startup.append(self.on_startup)
+        app.on_cleanup.append(self.on_cleanup)
+        return app
+
+
+if __name__ == "__main__":
+    import argparse
+
+    cli = argparse.ArgumentParser(description="Serve movie recommendations by emotion over HTTP.")
+    cli.add_argument("--host", default="127.0.0.1")
+    cli.add_argument("--port", type=int, default=8080)
+    cli.add_argument("--imdb-base-url", help="e.g. a local fixture server standing in for IMDb")
+    cli.add_argument("--ttl", type=float, default=recommender.TTL, help="seconds before a genre is refetched")
+    cli.add_argument("--parser", default="bs4-lxml", help="html_parsers backend")
+    args = cli.parse_args()
+
+    if args.imdb_base_url:
+        recommender.IMDB_BASE_URL = args.imdb_base_url.rstrip("/")
+    recommender.recommendations.ttl = args.ttl
+    recommender.recommendations.parser = args.parser
+    web.run_app(RecommendationService().app(), host=args.host, port=args.port)
@@ -1,91 +1,144 @@
-from bs4 import BeautifulSoup as SOUP
-import re
-import requests as HTTP
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from html_parsers import imdb_titles
+from http_session import fetch
+
+# IMDb genre recommended for each emotion
+EMOTION_GENRES = {
+	"Sad": "drama",
+	"Disgust": "musical",
+	"Anger": "family",
+	"Anticipation": "thriller",
+	"Fear": "sport",
+	"Enjoyment": "thriller",
+	"Trust": "western",
+	"Surprise": "film_noir",
+}
+GENRES = sorted(set(EMOTION_GENRES.values()))
+
+# IMDB_BASE_URL can point at a local fixture server standing in for IMDb
+IMDB_BASE_URL = os.environ.get("IMDB_BASE_URL", "http://www.imdb.com")
+IMDB_SEARCH_PATH = '/search/title?genres={genre}&title_type=feature&sort=moviemeter, asc'
+
+# How long a genre's title list is served before it is refetched
+TTL = 3600
+
+
+def genre_for(emotion):
+	# "sad", "Sad" and " SAD " all map to drama
+	try:
+		return EMOTION_GENRES[emotion.strip().capitalize()]
+	except KeyError:
+		raise ValueError(f"Unknown emotion {emotion!r}, expected one of {', '.join(EMOTION_GENRES)}") from None
+
+
+def fetch_titles(genre, parser="bs4-lxml"):
+	#HTTP request to get the data of the whole page
+	# (over the shared keep-alive session)
+	response = fetch(IMDB_BASE_URL + IMDB_SEARCH_PATH.format(genre=genre))
+	response.raise_for_status() # never cache an error page as "no movies"
+
+	# Extract movie titles (the text of the
+	# /title/tt.../ links) from the data
+	return imdb_titles(response.text, parser)
+
+
+class GenreCache:
+	"""
+	Parsed IMDb title lists per genre, held in memory.
+	`get` always answers from memory once a genre is loaded: a list older than `ttl` is still
+	returned while a background thread fetches the new one, so callers never wait on IMDb
+	(only the very first request for a genre does, unless `warm` ran first).
+	"""
+
+	def __init__(self, ttl=TTL, parser="bs4-lxml"):
+		self.ttl = ttl
+		self.parser = parser
+		self.entries = {} # genre -> (titles, time fetched)
+		self.refreshing = set() # genres with a background refresh in flight
+		self.lock = threading.Lock()
+		self.stopped = threading.Event()
+
+	def get(self, genre):
+		entry = self.entries.get(genre)
+		if entry is None:
+			return self.refresh(genre)
+		titles, fetched_at = entry
+		if time.monotonic() - fetched_at > self.ttl:
+			self.refresh_in_background(genre)
+		return titles
+
+	def refresh(self, genre):
+		titles = tuple(fetch_titles(genre, self.parser))
+		self.entries[genre] = (titles, time.monotonic())
+		return titles
+
+	def refresh_in_background(self, genre):
+		with self.lock:
+			if genre in self.refreshing:
+				return
+			self.refreshing.add(genre)
+
+		def run():
+			try:
+				self.refresh(genre)
+			except requests.RequestException as e:
+				# Keep serving the old list; the next lookup tries again
+				print(f"Failed to refresh {genre} titles: {e}")
+			finally:
+				with self.lock:
+					self.refreshing.discard(genre)
+
+		threading.Thread(target=run, daemon=True).start()
+
+	def warm(self, genres=GENRES, workers=4):
+		"""Loads every genre up front, a few at a time."""
+		with ThreadPoolExecutor(max_workers=workers) as pool:
+			list(pool.map(self.refresh, genres))
+
+	def start(self, interval=None):
+		"""Refreshes every loaded genre every `interval` seconds (default: half the TTL) in a daemon thread."""
+		interval = interval or self.ttl / 2
+
+		def run():
+			while not self.stopped.wait(interval):
+				for genre in list(self.entries):
+					self.refresh_in_background(genre)
+
+		threading.Thread(target=run, daemon=True).start()
+
+	def stop(self):
+		self.stopped.set()
+
+
+recommendations = GenreCache()
+
 
 # Main Function for scraping
-def main(emotion):
-
-	# IMDb Url for Drama genre of
-	# movie against emotion Sad
-	if(emotion == "Sad"):
-		urlhere = 'http://www.imdb.com/search/title?genres=drama&title_type=feature&sort=moviemeter, asc'
-
-	# IMDb Url for Musical genre of
-	# movie against emotion Disgust
-	elif(emotion == "Disgust"):
-		urlhere = 'http://www.imdb.com/search/title?genres=musical&title_type=feature&sort=moviemeter, asc'
-
-	# IMDb Url for Family genre of
-	# movie against emotion Anger
-	elif(emotion == "Anger"):
-		urlhere = 'http://www.imdb.com/search/title?genres=family&title_type=feature&sort=moviemeter, asc'
-
-	# IMDb Url for Thriller genre of
-	# movie against emotion Anticipation
-	elif(emotion == "Anticipation"):
-		urlhere = 'http://www.imdb.com/search/title?genres=thriller&title_type=feature&sort=moviemeter, asc'
-
-	# IMDb Url for Sport genre of
-	# movie against emotion Fear
-	elif(emotion == "Fear"):
-		urlhere = 'http://www.imdb.com/search/title?genres=sport&title_type=feature&sort=moviemeter, asc'
-
-	# IMDb Url for Thriller genre of
-	# movie against emotion Enjoyment
-	elif(emotion == "Enjoyment"):
-		urlhere = 'http://www.imdb.com/search/title?genres=thriller&title_type=feature&sort=moviemeter, asc'
-
-	# IMDb Url for Western genre of
-	# movie against emotion Trust
-	elif(emotion == "Trust"):
-		urlhere = 'http://www.imdb.com/search/title?genres=western&title_type=feature&sort=moviemeter, asc'
-
-	# IMDb Url for Film_noir genre of
-	# movie against emotion Surprise
-	elif(emotion == "Surprise"):
-		urlhere = 'http://www.imdb.com/search/title?genres=film_noir&title_type=feature&sort=moviemeter, asc'
-    
- #HTTP request to get the data of the whole page
-	response = HTTP.get(urlhere)
-	data = response.text
-
-	# Parsing the data using
-	# BeautifulSoup
-	soup = SOUP(data, "lxml")
-
-	# Extract movie titles from the
-	# data using regex
-	title = soup.find_all("a", attrs = {"href" : re.compile(r'\/title\/tt+\d*\/')})
-	return title
+def main(emotion, parser=None):
+	# Titles of the genre mapped to `emotion`, served from the in-memory cache.
+	# A `parser` other than the cache's ("lxml"/"selectolax" are fastest) fetches and parses
+	# the page with it for this call only, leaving the shared cache as configured
+	genre = genre_for(emotion)
+	if parser and parser != recommendations.parser:
+		return list(fetch_titles(genre, parser))
+	return list(recommendations.get(genre))
 
 if __name__ == '__main__':
 
 	emotion = input("Enter the emotion: ")
 	a = main(emotion)
-	count = 0
-
-	if(emotion == "disgust" or emotion == "anger"
-						or emotion=="surprise"):
-
-		for i in a:
 
-		
-			tmp = str(i).split('>;')
-
-			if(len(tmp) == 3):
-				print(tmp[1][:-3])
-
-			if(count > 13):
-				break
-			count += 1
+	if(emotion.strip().lower() in ("disgust", "anger", "surprise")):
+		count = 14
 	else:
-		for i in a:
-			tmp = str(i).split('>')
-
-			if(len(tmp) == 3):
-				print(tmp[1][:-3])
+		count = 12
 
-			if(count > 11):
-				break
-			count+=1
+	for title in a[:count]:
+		print(title)
 # Coded with 💙 by Mr. Unity Buddy
@@ -0,0 +1,89 @@
+"""
+Checks for ai_slop_detector.py's backend handling. The GPT-2 referee and tokenizer are replaced
+by tiny fakes, so no model is downloaded; torch, spaCy, NLTK and transformers must be installed.
+Run with `python -m pytest test_ai_slop_detector.py`.
+"""
+import pytest
+
+for module in ("torch", "spacy", "nltk", "transformers"):
+    pytest.importorskip(module)
+
+import spacy
+import torch
+
+import ai_slop_detector as detector
+
+VOCAB = 64
+TEXT = "The first sentence is long enough. The second one is long enough too. And a third for luck."
+
+
+class FakeTokenizer:
+    """Maps every character to a token id; just enough of the GPT-2 tokenizer for the batched path."""
+    pad_token = None
+    eos_token = "<eos>"
+    pad_token_id = 0
+    model_max_length = 1024
+
+    def __call__(self, text, **kwargs):
+        return {"input_ids": [1 + ord(c) % (VOCAB - 1) for c in text]}
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    built = []
+
+    def build_referee(model_id=detector.MODEL_ID, backend="torch", onnx_dir=detector.ONNX_DIR):
+        built.append(backend)
+        return (lambda input_ids, attention_mask: torch.zeros(*input_ids.shape, VOCAB)), 'cpu'
+
+    monkeypatch.setattr(detector, "build_referee", build_referee)
+    monkeypatch.setattr(detector, "nlp", spacy.blank("en"))
+    monkeypatch.setattr(detector, "tokenizer", FakeTokenizer())
+    monkeypatch.setattr(detector, "sent_tokenize", lambda text: [s + "." for s in text.split(". ") if s])
+    monkeypatch.setattr(detector, "referee", None)
+    monkeypatch.setattr(detector, "backend", None)
+    monkeypatch.setattr(detector, "perplexity_cache", None)
+    return built
+
+
+@pytest.mark.parametrize("backend_name", ["int8", "onnx"])
+def test_worker_backend_survives_scoring(builds, backend_name):
+    detector._init_worker(1, backend_name=backend_name)
+    records = detector._score_batch([("1", TEXT), ("2", TEXT)])
+
+    assert [record["id"] for record in records] == ["1", "2"]
+    assert detector.backend == backend_name
+    assert builds == [backend_name]
+
+
+def test_only_an_explicit_different_backend_rebuilds(builds):
+    detector.load_resources()
+    detector.load_resources()
+    detector.load_resources(backend_name="torch")
+    assert builds == ["torch"]
+
+    detector.load_resources(backend_name="int8")
+    detector.load_resources()
+    assert builds == ["torch", "int8"]
+    assert detector.backend == "int8"
+
+
+def test_accuracy_check_builds_only_the_two_compared_referees(builds):
+    report = detector.check_backend_accuracy(["A sentence long enough to score."] * 3, "int8")
+
+    assert builds == ["torch", "int8"]
+    assert report["passed"]
+    # The process-wide referee is not loaded as a side effect
+    assert detector.referee is None
+
+
+def test_read_corpus_accepts_long_csv_fields(tmp_path):
+    path = tmp_path / "corpus.csv"
+    long_text = "word " * 100_000
+    path.write_text(f"id,text\na,{long_text}\n,short\n", encoding="utf-8")
+
+    assert list(detector.read_corpus(str(path))) == [("a", long_text), ("1", "short")]
+
+
+def test_default_workers_fit_in_memory():
+    assert 1 <= detector.default_workers() <= (detector.os.cpu_count() or 1)
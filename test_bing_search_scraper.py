@@ -0,0 +1,88 @@
+"""
+Runs scrape_bing_many against a local http.server standing in for Bing (no network needed).
+Run with `python -m pytest test_bing_search_scraper.py`.
+"""
+import html
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from bing_search_scraper import RESULTS_PER_PAGE, scrape_bing_batch
+
+PAGES_PER_QUERY = 2 # the fixture has results for two pages; later pages repeat the last one, like Bing
+
+
+class FakeBing(BaseHTTPRequestHandler):
+    # Set per test by the `bing` fixture
+    requests = None
+    unavailable = None # query -> how many more 503s to answer with
+
+    def do_GET(self):
+        params = parse_qs(urlsplit(self.path).query)
+        query = params["q"][0]
+        first = int(params.get("first", ["1"])[0])
+        self.requests.append((query, first))
+
+        if self.unavailable[query] > 0:
+            self.unavailable[query] -= 1
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+
+        page = min((first - 1) // RESULTS_PER_PAGE, PAGES_PER_QUERY - 1)
+        items = "".join(
+            f'<li class="b_algo"><h2><a href="https://example.com/{page}/{i}">{html.escape(query)} {page}.{i}</a></h2></li>'
+            for i in range(RESULTS_PER_PAGE)
+        )
+        body = f"<html><body><ol>{items}</ol></body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def bing():
+    FakeBing.requests = []
+    FakeBing.unavailable = Counter()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBing)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield FakeBing, f"http://127.0.0.1:{server.server_address[1]}/search"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pages_until_no_new_links_and_retries_503s(bing):
+    handler, base_url = bing
+    # "&", "#", "+" and spaces would split or cut the query if it were not URL-encoded
+    queries = ["apify", "c++ & co #1", "café 100%"]
+    for query in queries:
+        handler.unavailable[query] = 2
+
+    records = scrape_bing_batch(queries, pages=5, concurrency=2, per_host=2, retries=3, backoff=0.01,
+                                base_url=base_url)
+
+    for query in queries:
+        titles = [title for q, title, _ in records if q == query]
+        assert len(titles) == PAGES_PER_QUERY * RESULTS_PER_PAGE
+        assert all(title.startswith(query + " ") for title in titles)
+        # Two 503s, then pages 1 and 2, then page 3 repeats page 2 and ends the query
+        assert [first for q, first in handler.requests if q == query] == [1, 1, 1, 11, 21]
+
+
+def test_gives_up_after_retries(bing):
+    handler, base_url = bing
+    handler.unavailable["down"] = 100
+
+    records = scrape_bing_batch(["down", "up"], pages=2, retries=2, backoff=0.01, base_url=base_url)
+
+    assert {q for q, _, _ in records} == {"up"}
+    assert len([q for q, _ in handler.requests if q == "down"]) == 3
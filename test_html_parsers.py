@@ -0,0 +1,23 @@
+"""
+Checks that every html_parsers backend extracts the same records from small inline pages.
+Run with `python -m pytest test_html_parsers.py`.
+"""
+import pytest
+
+from html_parsers import BACKENDS, google_news_items
+
+NEWS_PAGE = """<html><body>
+<div class="W8yrY"><article><a class="gPFEn" href="./read/CBMiABC?hl=en-US&amp;gl=US">First</a>
+  <div class="vr1PYe">Source A</div></article></div>
+<div class="W8yrY"><article><a class="gPFEn" href="/articles/XYZ?oc=5">Second</a></article></div>
+<div class="W8yrY"><article><a class="gPFEn">No link</a><div class="vr1PYe">Source C</div></article></div>
+</body></html>"""
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_news_links_resolve_against_the_site_root(backend):
+    assert google_news_items(NEWS_PAGE, backend) == [
+        {'source': 'Source A', 'headline': 'First', 'link': 'https://news.google.com/read/CBMiABC'},
+        {'source': 'Unknown source', 'headline': 'Second', 'link': 'https://news.google.com/articles/XYZ'},
+        {'source': 'Source C', 'headline': 'No link', 'link': ''},
+    ]
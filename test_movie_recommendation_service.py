@@ -0,0 +1,115 @@
+"""
+Runs movie_recommendation_service against a local http.server standing in for IMDb (no network needed).
+Run with `python -m pytest test_movie_recommendation_service.py`.
+"""
+import asyncio
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+import movie_recommendation_system as recommender
+from movie_recommendation_service import RecommendationService
+
+TITLES_PER_GENRE = 20
+
+
+class FakeIMDb(BaseHTTPRequestHandler):
+    # Set per test by the `imdb` fixture
+    hits = None # genre -> requests served
+    missing = None # genres answered with a 404 error page
+    delay = 0.2 # seconds per page, so concurrent cold requests overlap
+
+    def do_GET(self):
+        genre = parse_qs(urlsplit(self.path).query)["genres"][0]
+        self.hits[genre] += 1
+        time.sleep(self.delay)
+        if genre in self.missing:
+            self.send_error(404)
+            return
+
+        body = "".join(f'<a href="/title/tt{i:07d}/">{genre} {i}</a>' for i in range(TITLES_PER_GENRE)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def imdb(monkeypatch):
+    FakeIMDb.hits = Counter()
+    FakeIMDb.missing = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeIMDb)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(recommender, "IMDB_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    yield FakeIMDb
+    server.shutdown()
+    server.server_close()
+
+
+def service():
+    return RecommendationService(recommender.GenreCache(parser="html.parser"))
+
+
+def test_cold_requests_share_one_upstream_fetch(imdb):
+    svc = service()
+
+    async def run():
+        return await asyncio.gather(*(svc.titles("drama") for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert all(titles == results[0] for titles in results)
+    assert len(results[0]) == TITLES_PER_GENRE
+    assert imdb.hits["drama"] == 1
+    assert svc.metrics.upstream_fetches == 1
+    assert svc.metrics.coalesced == 9
+    assert svc.inflight == {}
+
+
+def test_http_api(imdb):
+    imdb.missing.add("western") # "Trust" maps to western
+    svc = service()
+
+    async def run():
+        async with TestClient(TestServer(svc.app())) as client:
+            # Startup warmed every genre once; western failed and is not cached
+            assert sum(imdb.hits.values()) == len(recommender.GENRES)
+
+            response = await client.get("/recommendations/sad", params={"limit": "3"})
+            assert response.status == 200
+            assert await response.json() == {"emotion": "sad", "genre": "drama",
+                                             "titles": ["drama 0", "drama 1", "drama 2"]}
+            response = await client.get("/recommendations", params={"emotion": " FEAR "})
+            assert len((await response.json())["titles"]) == 12
+
+            for path, params in [("/recommendations/bored", {}), ("/recommendations", {}),
+                                 ("/recommendations/sad", {"limit": "x"}),
+                                 ("/recommendations/sad", {"limit": "0"}),
+                                 ("/recommendations/sad", {"limit": "-2"})]:
+                response = await client.get(path, params=params)
+                assert response.status == 400, (path, params)
+
+            response = await client.get("/recommendations/trust")
+            assert response.status == 502
+            assert "western" in await response.text()
+
+            metrics = await (await client.get("/metrics")).json()
+            assert metrics["requests"] == 8
+            assert metrics["errors"] == 6
+            assert metrics["p50_ms"] is not None and metrics["p99_ms"] >= metrics["p50_ms"]
+            # One warm-up fetch per genre, plus the retry of western on its request
+            assert metrics["upstream_fetches"] == len(recommender.GENRES) + 1
+            assert sorted(metrics["genres"]) == sorted(set(recommender.GENRES) - {"western"})
+            assert metrics["genres"]["drama"]["titles"] == TITLES_PER_GENRE
+        # Cached genres were answered from memory, never refetched
+        assert imdb.hits["drama"] == 1 and imdb.hits["western"] == 2
+
+    asyncio.run(run())